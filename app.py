@@ -1,21 +1,51 @@
 import streamlit as st
-import os
-from openai import OpenAI
+import asyncio
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from openai import RateLimitError
 from dotenv import load_dotenv
-import json
 from datetime import datetime
-import pandas as pd
 import plotly.express as px
 from mlops.metrics import MetricsTracker
+from backend.app.services.deadline import Deadline
+from backend.app.services.model_backends import BackendRouter, build_router
+from backend.app.services.rate_limiter import RateLimiter, estimate_tokens
+from backend.app.services.review_parser import REVIEW_FORMAT, parse_review
+from backend.app.services.serialization import ReviewMetrics
+from backend.app.services.single_flight import SingleFlight, request_key
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client and metrics tracker
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Initialize metrics tracker
 metrics_tracker = MetricsTracker()
 
-# Different prompt strategies for A/B testing
+MAX_TOKENS = 1000
+MAX_RATE_LIMIT_RETRIES = 3
+
+@st.experimental_singleton
+def get_single_flight() -> SingleFlight:
+    # Shared across sessions and reruns so concurrent identical reviews coalesce
+    return SingleFlight()
+
+@st.experimental_singleton
+def get_rate_limiter() -> RateLimiter:
+    # One set of request/token buckets for every session of this app
+    return RateLimiter()
+
+@st.experimental_singleton
+def get_router() -> BackendRouter:
+    # Set MODEL_BACKENDS (e.g. "openai:gpt-3.5-turbo,local:llama3,scorer") to add fallbacks
+    return build_router("openai:gpt-3.5-turbo", get_rate_limiter())
+
+@st.experimental_singleton
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    # Backends are async; run them on one long-lived loop shared by all sessions
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+# Different prompt strategies for A/B testing; all ask for REVIEW_FORMAT so parse_review can split the reply
 PROMPT_STRATEGIES = {
     "default": """Please review the following {language} code and provide a detailed analysis:
 
@@ -32,7 +62,7 @@ Please analyze the code for:
 4. Security concerns
 5. Performance considerations
 
-Provide your analysis in a structured format.""",
+""" + REVIEW_FORMAT,
 
     "detailed": """As an expert code reviewer, provide a comprehensive analysis of this {language} code:
 
@@ -50,7 +80,7 @@ Please provide:
 5. Performance optimization recommendations
 6. Best practices compliance check
 
-Format your response with clear sections and bullet points.""",
+""" + REVIEW_FORMAT,
 
     "concise": """Review this {language} code briefly:
 
@@ -66,7 +96,9 @@ Focus on:
 - Security risks
 - Performance bottlenecks
 
-Keep the response concise and actionable."""
+Keep the response concise and actionable.
+
+""" + REVIEW_FORMAT
 }
 
 def create_code_review_prompt(code: str, language: str, context: str = None, prompt_version: str = "default") -> str:
@@ -77,32 +109,58 @@ def create_code_review_prompt(code: str, language: str, context: str = None, pro
         context=context if context else "No additional context provided"
     )
 
+def complete_review(prompt: str, deadline: Deadline) -> str:
+    limiter = get_rate_limiter()
+    messages = [
+        {"role": "system", "content": "You are an expert code reviewer with deep knowledge of software engineering best practices."},
+        {"role": "user", "content": prompt}
+    ]
+    estimated = estimate_tokens(prompt, MAX_TOKENS)
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        # The backend has already paused the limiter for the 429's retry-after
+        if not limiter.acquire(estimated, timeout=deadline.remaining()):
+            raise deadline.exceeded("rate-limit wait")
+        completion = asyncio.run_coroutine_threadsafe(
+            get_router().complete(messages, temperature=0.7, max_tokens=MAX_TOKENS),
+            get_event_loop()
+        )
+        # Once sent, the prompt is billed even if the call fails or times out
+        actual = estimate_tokens(prompt, 0)
+        try:
+            review_text = completion.result(timeout=deadline.remaining())
+            actual += len(review_text) // 4
+            return review_text
+        except FutureTimeoutError:
+            # Cancelling the task closes the upstream stream
+            completion.cancel()
+            raise deadline.exceeded("completion")
+        except RateLimitError:
+            # Throttled requests are not billed
+            actual = 0
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+        finally:
+            limiter.reconcile(estimated, actual)
+
 def review_code(code: str, language: str, context: str = None, prompt_version: str = "default"):
     try:
+        deadline = Deadline()
         prompt = create_code_review_prompt(code, language, context, prompt_version)
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an expert code reviewer with deep knowledge of software engineering best practices."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
 
-        review_text = response.choices[0].message.content
+        # Identical reviews already in flight share one completion
+        key = request_key(code, language, context, prompt_version, get_router().primary.name)
+        try:
+            review_text = get_single_flight().do(
+                key, lambda: complete_review(prompt, deadline), timeout=deadline.remaining()
+            )
+        except FutureTimeoutError:
+            raise deadline.exceeded("completion")
         
         # Parse the review text into structured format
-        # This is a simplified parser - you might want to make it more robust
-        review_results = {
-            "suggestions": ["Add input validation for zero division."],  # Example
-            "quality_score": 0.8,  # Example score
-            "potential_bugs": ["ZeroDivisionError"],
-            "improvement_areas": ["Add error handling for division by zero."]
-        }
+        review_results = parse_review(review_text)
         
         # Log metrics
+        deadline.check("logging")
         metrics_tracker.log_review_metrics(code, language, review_results, prompt_version)
         
         return review_text, review_results
@@ -116,18 +174,13 @@ def display_metrics(review_results):
         return
     
     # Create metrics visualization
-    metrics_data = {
-        "Metric": ["Quality Score", "Suggestions", "Potential Bugs", "Improvement Areas"],
-        "Count": [
-            review_results["quality_score"],
-            len(review_results["suggestions"]),
-            len(review_results["potential_bugs"]),
-            len(review_results["improvement_areas"])
-        ]
-    }
-    
-    df = pd.DataFrame(metrics_data)
-    fig = px.bar(df, x="Metric", y="Count", title="Code Review Metrics")
+    metrics = ReviewMetrics.from_findings(review_results)
+    fig = px.bar(
+        x=["Quality Score", "Suggestions", "Potential Bugs", "Improvement Areas"],
+        y=[metrics.quality_score, metrics.num_suggestions, metrics.num_bugs, metrics.num_improvements],
+        labels={"x": "Metric", "y": "Count"},
+        title="Code Review Metrics"
+    )
     st.plotly_chart(fig)
 
 def main():
@@ -1,17 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+import asyncio
 import os
 from dotenv import load_dotenv
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+from backend.app.services.deadline import Deadline, DeadlineExceeded
+from backend.app.services.llm_service import LLMService
+from backend.app.services.rate_limiter import FairScheduler, Priority
+from backend.app.services.serialization import dumps
+from backend.app.services.shared_state import SQLiteReviewCache, SharedRateLimiter
+from mlops.monitoring.setup_monitoring import CANCELLED_REVIEWS, metrics_registry
 
 # Load environment variables
 load_dotenv()
 
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson (when available) straight from review records"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
 app = FastAPI(
     title="AI Code Review Assistant",
     description="An intelligent code review system using LLMs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -23,11 +40,46 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def create_llm_service() -> LLMService:
+    # Under gunicorn (backend/gunicorn.conf.py) workers share the review cache and rate limits
+    state_dir = os.getenv("SHARED_STATE_DIR")
+    if not state_dir:
+        return LLMService()
+    return LLMService(
+        scheduler=FairScheduler(SharedRateLimiter(os.path.join(state_dir, "rate_limits.db"))),
+        cache=SQLiteReviewCache(os.path.join(state_dir, "review_cache.db"))
+    )
+
+llm_service = create_llm_service()
+
+# How often an in-progress review checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 0.25
+
+class ClientDisconnected(Exception):
+    pass
+
+async def run_until_disconnect(task: asyncio.Task, request: Request):
+    """Await ``task``, cancelling it (and its upstream completion) if the client goes away"""
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                CANCELLED_REVIEWS.labels(reason="disconnect").inc()
+                raise ClientDisconnected()
+    finally:
+        task.cancel()
+
 # Models
 class CodeReviewRequest(BaseModel):
     code: str
     language: str
     context: Optional[str] = None
+    tenant: str = "default"
+    priority: Priority = "interactive"
+    # Seconds the client is willing to wait; defaults to REVIEW_TIMEOUT, capped at REVIEW_MAX_TIMEOUT
+    timeout: Optional[float] = Field(default=None, gt=0)
 
 class CodeReviewResponse(BaseModel):
     suggestions: List[str]
@@ -41,16 +93,20 @@ async def root():
     return {"message": "Welcome to AI Code Review Assistant API"}
 
 @app.post("/api/review", response_model=CodeReviewResponse)
-async def review_code(request: CodeReviewRequest):
+async def review_code(request: CodeReviewRequest, http_request: Request):
     try:
-        # TODO: Implement code review logic using LLM
-        # This is a placeholder response
-        return CodeReviewResponse(
-            suggestions=["Consider adding type hints", "Add docstring to function"],
-            quality_score=0.85,
-            potential_bugs=["Possible null reference in line 15"],
-            improvement_areas=["Code organization", "Error handling"]
-        )
+        review = asyncio.ensure_future(llm_service.review_code(
+            request.code, request.language, request.context, request.tenant, request.priority,
+            deadline=Deadline(request.timeout)
+        ))
+        review_results = await run_until_disconnect(review, http_request)
+        # Encode the findings record directly; CodeReviewResponse documents the schema
+        return FastJSONResponse(review_results)
+    except ClientDisconnected:
+        # Nobody is listening; 499 only shows up in access logs
+        return Response(status_code=499)
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -58,6 +114,10 @@ async def review_code(request: CodeReviewRequest):
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
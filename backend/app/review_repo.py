@@ -0,0 +1,226 @@
+"""Review every source file in a local repository.
+
+Results are kept in a manifest keyed by the hash of each file's normalized content,
+language, model and prompt/parser version, so reruns only send new or changed files
+to the LLM.
+
+    python -m backend.app.review_repo path/to/repo --format sarif --output review.sarif
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from backend.app.services.deadline import Deadline
+from backend.app.services.llm_service import LLMService
+from backend.app.services.serialization import ReviewFindings, dumps
+from backend.app.services.shared_state import SQLiteReviewCache
+
+# Languages offered by the Streamlit UI
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".java": "java",
+    ".c": "cpp",
+    ".cc": "cpp",
+    ".cpp": "cpp",
+    ".cxx": "cpp",
+    ".h": "cpp",
+    ".hh": "cpp",
+    ".hpp": "cpp",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".rs": "rust"
+}
+
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "venv", ".venv", "__pycache__", "build", "dist", "target", "mlruns"}
+
+MANIFEST_NAME = ".code-review-manifest.db"
+# Reviews stay valid until the file changes
+MANIFEST_TTL = 10 * 365 * 24 * 3600
+
+
+def iter_source_files(root: str, max_bytes: int) -> Iterator[Tuple[str, str]]:
+    """Yield (relative path, language) for reviewable files under ``root``"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        for filename in sorted(filenames):
+            language = LANGUAGE_EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+            if language is None:
+                continue
+            path = os.path.join(dirpath, filename)
+            # Skips dangling symlinks and anything else that isn't a readable regular file
+            if not os.path.isfile(path) or os.path.getsize(path) > max_bytes:
+                continue
+            yield os.path.relpath(path, root).replace(os.sep, "/"), language
+
+
+def read_source(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def to_sarif(results: Dict[str, ReviewFindings]) -> dict:
+    rules = [
+        {"id": "potential-bug", "shortDescription": {"text": "Potential bug"}},
+        {"id": "improvement-area", "shortDescription": {"text": "Area for improvement"}},
+        {"id": "suggestion", "shortDescription": {"text": "Suggestion"}}
+    ]
+    sarif_results = []
+    for path, findings in results.items():
+        for rule_id, level, messages in (
+            ("potential-bug", "warning", findings.potential_bugs),
+            ("improvement-area", "note", findings.improvement_areas),
+            ("suggestion", "note", findings.suggestions)
+        ):
+            for message in messages:
+                sarif_results.append({
+                    "ruleId": rule_id,
+                    "level": level,
+                    "message": {"text": message},
+                    "locations": [{"physicalLocation": {"artifactLocation": {"uri": path}}}],
+                    "properties": {"qualityScore": findings.quality_score}
+                })
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "AI Code Review Assistant", "rules": rules}},
+            "results": sarif_results
+        }]
+    }
+
+
+async def review_repository(root: str,
+                            service: LLMService,
+                            jobs: int,
+                            max_bytes: int,
+                            tenant: str,
+                            timeout: Optional[float] = None) -> Tuple[Dict[str, ReviewFindings], dict]:
+    """Review ``root``, using ``service.cache`` as the manifest.
+
+    The service only stores reviews produced by its primary model, so files
+    answered by a fallback backend are reviewed again on the next run.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+    started = time.monotonic()
+    manifest = service.cache
+    results: Dict[str, ReviewFindings] = {}
+    pending: List[Tuple[str, str, str]] = []
+    unreadable = 0
+
+    for path, language in iter_source_files(root, max_bytes):
+        code = read_source(os.path.join(root, path))
+        if code is None:
+            unreadable += 1
+            continue
+        cached = manifest.get(service.review_key(code, language)) if manifest is not None else None
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append((path, language, code))
+
+    skipped = len(results)
+    total = skipped + len(pending)
+    print(f"{total} files, {skipped} unchanged, {len(pending)} to review", file=sys.stderr)
+
+    semaphore = asyncio.Semaphore(jobs)
+    failed = 0
+    completed = 0
+
+    async def review(path: str, language: str, code: str):
+        nonlocal failed, completed
+        async with semaphore:
+            try:
+                findings = await service.review_code(
+                    code, language, tenant=tenant, priority="bulk", deadline=Deadline(timeout)
+                )
+            except Exception as e:
+                failed += 1
+                print(f"  failed {path}: {e}", file=sys.stderr)
+                return
+        results[path] = findings
+        completed += 1
+        print(f"  [{completed + failed}/{len(pending)}] {path}", file=sys.stderr)
+
+    await asyncio.gather(*(review(*item) for item in pending))
+
+    elapsed = time.monotonic() - started
+    stats = {
+        "files": total,
+        "reviewed": completed,
+        "skipped": skipped,
+        "failed": failed,
+        "unreadable": unreadable,
+        "skipped_ratio": skipped / total if total else 1.0,
+        "elapsed_seconds": elapsed,
+        "files_per_second": total / elapsed if elapsed else 0.0
+    }
+    return dict(sorted(results.items())), stats
+
+
+def _positive(cast):
+    """argparse type that also rejects zero and negative values"""
+    def parse(value: str):
+        try:
+            number = cast(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid {cast.__name__} value: {value!r}")
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+        return number
+    return parse
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Review every source file in a repository")
+    parser.add_argument("root", help="path to the repository")
+    parser.add_argument("--format", choices=["json", "sarif"], default="json")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--manifest", help=f"manifest database (default: <root>/{MANIFEST_NAME})")
+    parser.add_argument("--jobs", type=_positive(int), default=8, help="concurrent reviews")
+    parser.add_argument("--max-bytes", type=_positive(int), default=200_000, help="skip files larger than this")
+    parser.add_argument("--tenant", default="cli", help="tenant charged by the rate-limit scheduler")
+    parser.add_argument("--timeout", type=_positive(float), help="per-file review deadline in seconds (default: REVIEW_TIMEOUT, at most REVIEW_MAX_TIMEOUT)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    root = os.path.abspath(args.root)
+    manifest = SQLiteReviewCache(args.manifest or os.path.join(root, MANIFEST_NAME), ttl=MANIFEST_TTL)
+
+    results, stats = asyncio.run(
+        review_repository(root, LLMService(cache=manifest), args.jobs, args.max_bytes, args.tenant, args.timeout)
+    )
+
+    if args.format == "sarif":
+        report = to_sarif(results)
+    else:
+        report = {"files": results, "stats": stats}
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(dumps(report))
+    else:
+        sys.stdout.buffer.write(dumps(report) + b"\n")
+
+    print(
+        f"{stats['files']} files in {stats['elapsed_seconds']:.2f}s "
+        f"({stats['files_per_second']:.1f} files/s): {stats['reviewed']} reviewed, "
+        f"{stats['skipped']} skipped ({stats['skipped_ratio']:.0%}), {stats['failed']} failed",
+        file=sys.stderr
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from mlops.monitoring.setup_monitoring import CANCELLED_REVIEWS
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT = float(os.getenv("REVIEW_TIMEOUT", "60"))
+# Longest budget a caller may ask for; longer requested timeouts are clamped to it
+MAX_TIMEOUT = float(os.getenv("REVIEW_MAX_TIMEOUT", str(DEFAULT_TIMEOUT)))
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a review runs past its time budget"""
+
+
+class Deadline:
+    """Absolute time budget for one review, carried from the entry point down to the LLM call"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        if timeout is not None and not timeout > 0:
+            raise ValueError(f"Review timeout must be positive, got {timeout}")
+        self.timeout = min(DEFAULT_TIMEOUT if timeout is None else timeout, MAX_TIMEOUT)
+        self.expires_at = time.monotonic() + self.timeout
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def exceeded(self, stage: str) -> DeadlineExceeded:
+        """Record an expired review and build the error to raise"""
+        CANCELLED_REVIEWS.labels(reason="deadline").inc()
+        return DeadlineExceeded(f"Review deadline of {self.timeout:g}s exceeded during {stage}")
+
+    def check(self, stage: str):
+        """Fail fast before starting ``stage`` if the budget is already spent"""
+        if self.expired:
+            raise self.exceeded(stage)
+
+    async def run(self, awaitable: Awaitable[T], stage: str) -> T:
+        """Await ``awaitable``, cancelling it if the deadline passes first"""
+        if self.expired:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise self.exceeded(stage)
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError:
+            raise self.exceeded(stage) from None
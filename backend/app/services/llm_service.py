@@ -1,12 +1,32 @@
-import os
-from openai import OpenAI
-from typing import List, Dict, Any
+import asyncio
+from openai import RateLimitError
+from mlops.monitoring.setup_monitoring import REVIEW_CACHE_HITS
+from typing import List, Dict, Any, Tuple
 import json
 
+from backend.app.services.deadline import Deadline
+from backend.app.services.model_backends import BackendRouter, build_router
+from backend.app.services.rate_limiter import FairScheduler, Priority, estimate_tokens
+from backend.app.services.review_parser import PARSER_VERSION, REVIEW_FORMAT, parse_review
+from backend.app.services.serialization import ReviewFindings
+from backend.app.services.shared_state import SQLiteReviewCache
+from backend.app.services.single_flight import AsyncSingleFlight, request_key
+
+MAX_RATE_LIMIT_RETRIES = 3
+# Part of every review cache key; bump when the review prompt changes
+PROMPT_VERSION = "structured-1"
+
 class LLMService:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4"  # or "gpt-3.5-turbo" based on requirements
+    def __init__(self,
+                 scheduler: FairScheduler = None,
+                 router: BackendRouter = None,
+                 cache: SQLiteReviewCache = None):
+        self.scheduler = scheduler or FairScheduler()
+        # Set MODEL_BACKENDS (e.g. "openai:gpt-4,local:llama3,scorer") to add fallbacks
+        self.router = router or build_router("openai:gpt-4", self.scheduler.limiter)
+        self.model = self.router.primary.name
+        self.single_flight = AsyncSingleFlight()
+        self.cache = cache
 
     def _create_code_review_prompt(self, code: str, language: str, context: str = None) -> str:
         return f"""Please review the following {language} code and provide a detailed analysis:
@@ -24,46 +44,99 @@ Please analyze the code for:
 4. Security concerns
 5. Performance considerations
 
-Provide your analysis in a structured format."""
-
-    async def review_code(self, code: str, language: str, context: str = None) -> Dict[str, Any]:
+{REVIEW_FORMAT}"""
+
+    def review_key(self, code: str, language: str, context: str = None) -> str:
+        """Cache and single-flight key; changes with the model, prompt and parser"""
+        return request_key(code, language, context, f"{PROMPT_VERSION}/parser-{PARSER_VERSION}", self.model)
+
+    async def _complete(self,
+                        messages: List[Dict[str, str]],
+                        temperature: float,
+                        max_tokens: int,
+                        tenant: str = "default",
+                        priority: Priority = "interactive") -> Tuple[str, str]:
+        """Run one chat completion through the fair scheduler and backend router, retrying on 429s.
+
+        Returns the completion text and the name of the backend that produced it.
+        """
+        prompt = "".join(m["content"] for m in messages)
+        estimated = estimate_tokens(prompt, max_tokens)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            # The backend has already paused the limiter for the 429's retry-after
+            await self.scheduler.acquire(estimated, tenant, priority)
+            # Once sent, the prompt is billed even if the call fails or is cancelled
+            actual = estimate_tokens(prompt, 0)
+            try:
+                content, backend = await self.router.complete_with_backend(messages, temperature, max_tokens)
+                actual += len(content) // 4
+                return content, backend.name
+            except RateLimitError:
+                # Throttled requests are not billed
+                actual = 0
+                if attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+            finally:
+                self.scheduler.reconcile(estimated, actual)
+
+    async def review_code(self,
+                          code: str,
+                          language: str,
+                          context: str = None,
+                          tenant: str = "default",
+                          priority: Priority = "interactive",
+                          deadline: Deadline = None) -> ReviewFindings:
+        deadline = deadline or Deadline()
+        key = self.review_key(code, language, context)
+        if self.cache is not None:
+            # SQLite may wait on another worker's write lock; keep it off the event loop
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                REVIEW_CACHE_HITS.inc()
+                return cached
+
+        # Identical reviews already in flight share one completion. The deadline bounds
+        # this caller's wait; prompt build, rate-limit wait and the streaming completion
+        # are cancelled once every caller waiting on them has given up.
+        findings, served_by = await deadline.run(
+            self.single_flight.do(key, lambda: self._review_code(code, language, context, tenant, priority)),
+            "review"
+        )
+        # The key names the primary model; a fallback or hedge backend's review is
+        # returned but not cached, so the primary gets to review this code next time
+        if self.cache is not None and served_by == self.model:
+            await asyncio.to_thread(self.cache.set, key, findings)
+        return findings
+
+    async def _review_code(self,
+                           code: str,
+                           language: str,
+                           context: str = None,
+                           tenant: str = "default",
+                           priority: Priority = "interactive") -> Tuple[ReviewFindings, str]:
         try:
             prompt = self._create_code_review_prompt(code, language, context)
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            review_text, served_by = await self._complete(
+                [
                     {"role": "system", "content": "You are an expert code reviewer with deep knowledge of software engineering best practices."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                tenant=tenant,
+                priority=priority
             )
-
-            # Parse the response and structure it
-            review_text = response.choices[0].message.content
-            
-            # TODO: Implement proper parsing of the LLM response
-            # This is a placeholder implementation
-            return {
-                "suggestions": [
-                    "Consider adding type hints",
-                    "Add docstring to function"
-                ],
-                "quality_score": 0.85,
-                "potential_bugs": [
-                    "Possible null reference in line 15"
-                ],
-                "improvement_areas": [
-                    "Code organization",
-                    "Error handling"
-                ]
-            }
+            return parse_review(review_text), served_by
 
         except Exception as e:
             raise Exception(f"Error in code review: {str(e)}")
 
-    async def evaluate_code_quality(self, code: str, language: str) -> float:
+    async def evaluate_code_quality(self,
+                                    code: str,
+                                    language: str,
+                                    tenant: str = "default",
+                                    priority: Priority = "interactive") -> float:
         try:
             prompt = f"""Rate the quality of this {language} code on a scale of 0 to 1:
 
@@ -78,17 +151,18 @@ Consider:
 
 Provide only a number between 0 and 1."""
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            content, _ = await self._complete(
+                [
                     {"role": "system", "content": "You are an expert code reviewer."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=10
+                max_tokens=10,
+                tenant=tenant,
+                priority=priority
             )
 
-            score = float(response.choices[0].message.content.strip())
+            score = float(content.strip())
             return min(max(score, 0), 1)  # Ensure score is between 0 and 1
 
         except Exception as e:
@@ -0,0 +1,357 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import re
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI, RateLimitError
+
+from backend.app.services.rate_limiter import RateLimiter, estimate_tokens, parse_retry_after
+
+# First-token latency (seconds) assumed for a model before enough samples are seen
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_LATENCY_SAMPLES = 20
+
+
+class BackendUnavailableError(Exception):
+    """Raised when every configured backend is failing or circuit-broken"""
+
+
+class ModelBackend(ABC):
+    """A chat-completion provider that streams text deltas"""
+
+    name = "backend"
+
+    @abstractmethod
+    def stream(self,
+               messages: List[Dict[str, str]],
+               temperature: float,
+               max_tokens: int) -> AsyncIterator[str]:
+        """Yield the completion's text deltas as they arrive"""
+
+    async def complete(self,
+                       messages: List[Dict[str, str]],
+                       temperature: float,
+                       max_tokens: int) -> str:
+        return "".join([delta async for delta in self.stream(messages, temperature, max_tokens)])
+
+
+class OpenAICompatibleBackend(ModelBackend):
+    """OpenAI, or any server speaking the OpenAI chat-completions API (vLLM, Ollama, ...)"""
+
+    def __init__(self,
+                 model: str,
+                 base_url: Optional[str] = None,
+                 api_key: Optional[str] = None,
+                 limiter: Optional[RateLimiter] = None):
+        self.model = model
+        self.name = model if base_url is None else f"{model}@{base_url}"
+        # 429s are retried by LLMService through the shared limiter, not inside the client
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            base_url=base_url,
+            max_retries=0
+        )
+        self.limiter = limiter
+
+    async def stream(self,
+                     messages: List[Dict[str, str]],
+                     temperature: float,
+                     max_tokens: int) -> AsyncIterator[str]:
+        try:
+            raw = await self.client.chat.completions.with_raw_response.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+        except RateLimitError as e:
+            if self.limiter is not None:
+                self.limiter.on_rate_limited(parse_retry_after(e.response.headers))
+            raise
+
+        if self.limiter is not None:
+            self.limiter.update_from_headers(raw.headers)
+        stream = raw.parse()
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        finally:
+            # Close the connection so a cancelled review stops generating upstream tokens
+            await stream.response.aclose()
+
+
+class LocalModelBackend(OpenAICompatibleBackend):
+    """Self-hosted model server exposing an OpenAI-compatible endpoint"""
+
+    def __init__(self, model: str, base_url: Optional[str] = None):
+        super().__init__(
+            model,
+            base_url=base_url or os.getenv("LOCAL_MODEL_URL", "http://localhost:11434/v1"),
+            api_key="not-needed"
+        )
+
+
+class InProcessScorerBackend(ModelBackend):
+    """Rule-based reviewer that runs in-process; a last-resort fallback with no network hop"""
+
+    name = "scorer"
+
+    # (pattern, findings section, message)
+    CHECKS = [
+        (re.compile(r"^\s*except\s*:", re.M), "Potential bugs", "Bare `except:` hides unexpected errors; catch specific exceptions."),
+        (re.compile(r"\beval\(|\bexec\("), "Potential bugs", "`eval`/`exec` on dynamic input is a security risk."),
+        (re.compile(r"\b(TODO|FIXME|XXX)\b"), "Improvement areas", "Unresolved TODO/FIXME markers remain in the code."),
+        (re.compile(r"^\s*print\(", re.M), "Suggestions", "Debug `print` calls should use logging instead."),
+        (re.compile(r"^.{121,}$", re.M), "Suggestions", "Some lines exceed 120 characters; consider wrapping them."),
+    ]
+    SECTIONS = ["Potential bugs", "Improvement areas", "Suggestions"]
+
+    async def stream(self,
+                     messages: List[Dict[str, str]],
+                     temperature: float,
+                     max_tokens: int) -> AsyncIterator[str]:
+        code = messages[-1]["content"] if messages else ""
+        findings = [(section, message) for pattern, section, message in self.CHECKS if pattern.search(code)]
+        score = max(0.0, 1.0 - 0.15 * len(findings))
+
+        # Same layout as review_parser.REVIEW_FORMAT
+        yield f"Quality score: {score:.2f}\n"
+        for section in self.SECTIONS:
+            yield f"\n{section}:\n"
+            messages_in_section = [message for s, message in findings if s == section]
+            for message in messages_in_section or ["None"]:
+                yield f"- {message}\n"
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of first-token latencies for one backend"""
+
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, p: float, default: float = DEFAULT_HEDGE_DELAY) -> float:
+        if len(self.samples) < MIN_LATENCY_SAMPLES:
+            return default
+        ordered = sorted(self.samples)
+        return ordered[min(int(p * len(ordered)), len(ordered) - 1)]
+
+
+class BackendRouter:
+    """Sends a completion to the first healthy backend, hedging and failing over to the rest.
+
+    With ``hedge_percentile`` set, a backup request is fired at the next healthy
+    backend when the primary has not produced its first token within that
+    percentile of its own observed first-token latency. Whichever attempt streams
+    first is kept and the other is cancelled. A hedge to a rate-limited backend is
+    charged to its limiter and skipped while the limiter has no spare capacity.
+    Failed attempts count against the backend's circuit breaker and the next
+    backend is tried; 429s fail over too but leave the breaker alone.
+    """
+
+    def __init__(self,
+                 backends: List[ModelBackend],
+                 hedge_percentile: Optional[float] = None,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        if not backends:
+            raise ValueError("At least one model backend is required")
+        self.backends = backends
+        self.hedge_percentile = hedge_percentile
+        self.breakers = {b.name: CircuitBreaker(failure_threshold, reset_timeout) for b in backends}
+        self.latency = {b.name: LatencyTracker() for b in backends}
+        self.hedged = 0
+
+    @property
+    def primary(self) -> ModelBackend:
+        return self.backends[0]
+
+    async def _attempt(self,
+                       backend: ModelBackend,
+                       first_token: asyncio.Event,
+                       messages: List[Dict[str, str]],
+                       temperature: float,
+                       max_tokens: int) -> str:
+        started = time.monotonic()
+        parts = []
+        try:
+            async for delta in backend.stream(messages, temperature, max_tokens):
+                if not parts:
+                    self.latency[backend.name].observe(time.monotonic() - started)
+                    first_token.set()
+                parts.append(delta)
+        except (asyncio.CancelledError, RateLimitError):
+            # A cancelled hedge or a throttled call (quota, not an outage) says nothing
+            # about health; free a half-open probe slot
+            self.breakers[backend.name].probing = False
+            raise
+        except Exception:
+            self.breakers[backend.name].record_failure()
+            raise
+        self.breakers[backend.name].record_success()
+        first_token.set()
+        return "".join(parts)
+
+    async def complete(self,
+                       messages: List[Dict[str, str]],
+                       temperature: float,
+                       max_tokens: int) -> str:
+        text, _ = await self.complete_with_backend(messages, temperature, max_tokens)
+        return text
+
+    async def complete_with_backend(self,
+                                    messages: List[Dict[str, str]],
+                                    temperature: float,
+                                    max_tokens: int) -> Tuple[str, ModelBackend]:
+        """Like complete(), also returning the backend whose answer was used"""
+        queue = list(self.backends)
+        attempts: Dict[asyncio.Task, asyncio.Event] = {}
+        launched: Dict[asyncio.Task, ModelBackend] = {}
+        errors: List[Exception] = []
+        # The caller has admitted one call; hedges are extra provider calls and
+        # reserve their own capacity, released down to the prompt cost at the end
+        prompt_tokens = estimate_tokens("".join(m["content"] for m in messages), 0)
+        reserved: List[RateLimiter] = []
+
+        def launch(hedge: bool = False) -> Optional[ModelBackend]:
+            while queue:
+                backend = queue[0]
+                limiter = getattr(backend, "limiter", None) if hedge else None
+                if limiter is not None and limiter.try_acquire(prompt_tokens + max_tokens) > 0:
+                    # No spare capacity: don't hedge now, keep the backend for failover
+                    return None
+                queue.pop(0)
+                if not self.breakers[backend.name].allow():
+                    if limiter is not None:
+                        limiter.reconcile(prompt_tokens + max_tokens, 0, sent=False)
+                    continue
+                if limiter is not None:
+                    reserved.append(limiter)
+                first_token = asyncio.Event()
+                task = asyncio.ensure_future(self._attempt(backend, first_token, messages, temperature, max_tokens))
+                attempts[task] = first_token
+                launched[task] = backend
+                return backend
+            return None
+
+        primary = launch()
+        if primary is None:
+            raise BackendUnavailableError("All model backends are circuit-broken")
+
+        try:
+            while attempts:
+                delay = None
+                if self.hedge_percentile is not None and queue and len(attempts) == 1:
+                    delay = self.latency[primary.name].percentile(self.hedge_percentile)
+
+                signals = [asyncio.ensure_future(event.wait()) for event in attempts.values()]
+                done, _ = await asyncio.wait(
+                    list(attempts) + signals, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                for signal in signals:
+                    signal.cancel()
+
+                if not done:
+                    # Primary is slower than usual to start streaming: hedge
+                    if launch(hedge=True) is not None:
+                        self.hedged += 1
+                    continue
+
+                winner = next(
+                    (t for t, event in attempts.items()
+                     if event.is_set() and not (t.done() and t.exception() is not None)),
+                    None
+                )
+                if winner is not None:
+                    for task in attempts:
+                        if task is not winner:
+                            task.cancel()
+                    attempts = {winner: attempts[winner]}
+                    return await winner, launched[winner]
+
+                for task in [t for t in attempts if t.done()]:
+                    errors.append(task.exception())
+                    del attempts[task]
+                if not attempts:
+                    launch()
+        finally:
+            for task in attempts:
+                task.cancel()
+            for limiter in reserved:
+                limiter.reconcile(prompt_tokens + max_tokens, prompt_tokens)
+
+        if not errors:
+            raise BackendUnavailableError("All model backends are circuit-broken")
+        raise errors[-1]
+
+
+def build_backends(spec: str, limiter: Optional[RateLimiter] = None) -> List[ModelBackend]:
+    """Parse a backend list such as ``"openai:gpt-4,local:llama3,scorer"``"""
+    backends: List[ModelBackend] = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, model = entry.partition(":")
+        if kind == "openai":
+            backends.append(OpenAICompatibleBackend(model, base_url=os.getenv("OPENAI_BASE_URL"), limiter=limiter))
+        elif kind == "local":
+            backends.append(LocalModelBackend(model))
+        elif kind == "scorer":
+            backends.append(InProcessScorerBackend())
+        else:
+            raise ValueError(f"Unknown model backend: {entry}")
+    return backends
+
+
+def build_router(default_spec: str, limiter: Optional[RateLimiter] = None) -> BackendRouter:
+    """Router configured from ``MODEL_BACKENDS`` and ``LLM_HEDGE_PERCENTILE``"""
+    hedge = os.getenv("LLM_HEDGE_PERCENTILE")
+    return BackendRouter(
+        build_backends(os.getenv("MODEL_BACKENDS", default_spec), limiter),
+        hedge_percentile=float(hedge) if hedge else None
+    )
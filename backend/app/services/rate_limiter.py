@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Literal, Mapping, Optional, Tuple
+
+Priority = Literal["interactive", "batch", "bulk"]
+
+# Relative share of provider capacity per priority class
+PRIORITY_WEIGHTS = {
+    "interactive": 8.0,
+    "batch": 2.0,
+    "bulk": 1.0
+}
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of a completion: ~4 characters per prompt token plus the output cap"""
+    return len(prompt) // 4 + max_tokens
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to back off from a 429 response, or None if the provider didn't say"""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return None
+
+
+class TokenBucket:
+    """Continuously refilling bucket sized to a per-minute limit"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = max(now - self.updated, 0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 if available now)"""
+        self._refill(now)
+        # Requests larger than the bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60 / self.per_minute
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens -= amount
+
+    def set_limit(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = per_minute
+        self.tokens = min(self.tokens, self.capacity)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one provider.
+
+    Limits default to the ``LLM_RPM`` / ``LLM_TPM`` environment variables and are
+    re-synced from the provider's ``x-ratelimit-limit-*`` headers when present.
+    A 429 pauses all admissions until its retry-after has elapsed.
+    """
+
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.requests = TokenBucket(rpm or float(os.getenv("LLM_RPM", "500")))
+        self.tokens = TokenBucket(tpm or float(os.getenv("LLM_TPM", "90000")))
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: int) -> float:
+        """Take capacity for one call if available; otherwise return the seconds to wait"""
+        now = self._clock()
+        with self._lock:
+            wait = max(
+                self.paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now)
+            )
+            if wait <= 0:
+                self.requests.take(1, now)
+                self.tokens.take(tokens, now)
+            return wait
+
+    def acquire(self, tokens: int, timeout: Optional[float] = None) -> bool:
+        """Blocking acquire for threaded callers such as the Streamlit app.
+
+        Returns False without taking capacity if it won't free up within ``timeout``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def reconcile(self, estimated: int, actual: int, sent: bool = True):
+        """Correct the token bucket once the real usage of a completion is known.
+
+        ``sent=False`` also hands back the request slot of a call that never went out.
+        """
+        with self._lock:
+            self.tokens.tokens += estimated - actual
+            if not sent:
+                self.requests.tokens += 1
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        """Pause admissions after a 429, honouring the provider's retry-after"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self._clock() + (retry_after or 1.0))
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        with self._lock:
+            for bucket, name in ((self.requests, "requests"), (self.tokens, "tokens")):
+                value = headers.get(f"x-ratelimit-limit-{name}")
+                if value:
+                    try:
+                        bucket.set_limit(float(value))
+                    except ValueError:
+                        pass
+
+
+class FairScheduler:
+    """Weighted fair queue in front of a RateLimiter for async callers.
+
+    Each (tenant, priority) pair gets its own queue. Waiters are admitted in order
+    of their virtual finish time, ``start + cost / weight``, so an interactive
+    review overtakes queued bulk work while a heavy tenant cannot starve others
+    in the same class.
+    """
+
+    def __init__(self, limiter: Optional[RateLimiter] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.limiter = limiter or RateLimiter()
+        self.weights = weights or PRIORITY_WEIGHTS
+        self.virtual_time = 0.0
+        self._finish: Dict[Tuple[str, str], float] = {}
+        self._queue: List[Tuple[float, int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, tokens: int, tenant: str = "default", priority: Priority = "interactive"):
+        """Wait until this call is both next in fair order and within provider limits"""
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(self.weights)}")
+        flow = (tenant, priority)
+        weight = self.weights[priority]
+        start = max(self.virtual_time, self._finish.get(flow, 0.0))
+        finish = start + tokens / weight
+        self._finish[flow] = finish
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (finish, next(self._counter), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted, but cancelled before it could run; give the capacity back
+                self.reconcile(tokens, 0, sent=False)
+            raise
+
+    def reconcile(self, estimated: int, actual: int, sent: bool = True):
+        """Return unused capacity to the limiter and admit any waiter it now covers"""
+        self.limiter.reconcile(estimated, actual, sent)
+        if self._queue:
+            self._dispatch()
+
+    def pending(self) -> int:
+        return sum(1 for *_, future in self._queue if not future.done())
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            finish, _, tokens, future = self._queue[0]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            wait = self.limiter.try_acquire(tokens)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self.virtual_time = max(self.virtual_time, finish)
+            future.set_result(None)
+
+        # Idle flows restart from the current virtual time
+        self._finish = {flow: f for flow, f in self._finish.items() if f > self.virtual_time}
@@ -0,0 +1,100 @@
+import re
+from typing import Dict, List, Optional
+
+from backend.app.services.serialization import ReviewFindings
+
+# Bump whenever parse_review or REVIEW_FORMAT changes, so cached findings are not reused
+PARSER_VERSION = "2"
+
+# Appended to review prompts so the reply can be parsed into ReviewFindings
+REVIEW_FORMAT = """Format your answer exactly like this, one finding per bullet (write "- None" for an empty section):
+
+Quality score: <number between 0 and 1>
+
+Potential bugs:
+- ...
+
+Improvement areas:
+- ...
+
+Suggestions:
+- ..."""
+
+# Heading keywords for each findings field, checked in order
+SECTION_KEYWORDS = [
+    ("potential_bugs", re.compile(r"bug|issue|error|security|vulnerab", re.I)),
+    ("improvement_areas", re.compile(r"improve|performance|quality|best practice|maintainab", re.I)),
+    ("suggestions", re.compile(r"suggest|recommend", re.I))
+]
+SCORE_PATTERN = re.compile(r"score\W{0,5}(\d+(?:\.\d+)?)(?:\s*/\s*(\d+))?", re.I)
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+HEADING_PATTERN = re.compile(r"^\s*(?:#{1,6}\s*|\d+[.)]\s*)?\**([A-Za-z][^:*#]{0,60}?)\**\s*:?\**\s*$")
+# Placeholder bullets for an empty section: "None identified.", "No issues.", "N/A"...
+EMPTY_FINDING = re.compile(
+    r"^(none\b.*|n/?a|nothing(\s+(found|to report)\b.*)?"
+    r"|no\s+(\w+\s+)?(issues|problems|bugs|concerns|findings|suggestions)\b.*"
+    r"|no\b.*\b(found|detected|identified))\.?$",
+    re.I
+)
+
+
+def _section_for(line: str) -> Optional[str]:
+    """Findings field named by a heading line, if ``line`` is one"""
+    match = HEADING_PATTERN.match(line)
+    if match is None or not (line.rstrip().endswith(":") or line.lstrip().startswith(("#", "**"))):
+        return None
+    for field, keywords in SECTION_KEYWORDS:
+        if keywords.search(match.group(1)):
+            return field
+    return None
+
+
+def _parse_score(text: str) -> Optional[float]:
+    match = SCORE_PATTERN.search(text)
+    if match is None:
+        return None
+    score = float(match.group(1))
+    scale = float(match.group(2)) if match.group(2) else (1 if score <= 1 else 10 if score <= 10 else 100)
+    return min(max(score / scale, 0.0), 1.0)
+
+
+def parse_review(text: str) -> ReviewFindings:
+    """Split an LLM review written in REVIEW_FORMAT (or close to it) into findings.
+
+    Bullets are collected under the nearest recognised heading. A reply with no
+    recognisable structure is kept whole as a single suggestion, and a missing
+    score is estimated from the number of findings.
+    """
+    findings: Dict[str, List[str]] = {field: [] for field, _ in SECTION_KEYWORDS}
+    section = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        heading = _section_for(line)
+        if heading is not None:
+            section = heading
+            continue
+        if section is None or (SCORE_PATTERN.search(line) and not BULLET_PATTERN.match(line)):
+            continue
+
+        item = BULLET_PATTERN.sub("", line).strip().replace("**", "")
+        if EMPTY_FINDING.match(item):
+            continue
+        if BULLET_PATTERN.match(line) or not findings[section]:
+            findings[section].append(item)
+        else:
+            # Wrapped continuation of the previous bullet
+            findings[section][-1] += " " + item
+
+    if not any(findings.values()) and text.strip():
+        findings["suggestions"].append(text.strip())
+
+    score = _parse_score(text)
+    if score is None:
+        score = max(0.0, 1.0 - 0.15 * len(findings["potential_bugs"]) - 0.05 * len(findings["improvement_areas"]))
+    return ReviewFindings(
+        suggestions=findings["suggestions"],
+        quality_score=score,
+        potential_bugs=findings["potential_bugs"],
+        improvement_areas=findings["improvement_areas"]
+    )
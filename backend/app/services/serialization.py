@@ -0,0 +1,126 @@
+import dataclasses
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+@dataclass
+class ReviewFindings:
+    """Structured result of one code review"""
+
+    __slots__ = ("suggestions", "quality_score", "potential_bugs", "improvement_areas")
+    suggestions: List[str]
+    quality_score: float
+    potential_bugs: List[str]
+    improvement_areas: List[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReviewFindings":
+        return cls(
+            list(data.get("suggestions", [])),
+            float(data.get("quality_score", 0)),
+            list(data.get("potential_bugs", [])),
+            list(data.get("improvement_areas", []))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "suggestions": self.suggestions,
+            "quality_score": self.quality_score,
+            "potential_bugs": self.potential_bugs,
+            "improvement_areas": self.improvement_areas
+        }
+
+
+@dataclass
+class ReviewMetrics:
+    """Per-review counts logged to MLflow and the history store"""
+
+    __slots__ = ("quality_score", "num_suggestions", "num_bugs", "num_improvements")
+    quality_score: float
+    num_suggestions: int
+    num_bugs: int
+    num_improvements: int
+
+    @classmethod
+    def from_findings(cls, findings: ReviewFindings) -> "ReviewMetrics":
+        return cls(
+            findings.quality_score,
+            len(findings.suggestions),
+            len(findings.potential_bugs),
+            len(findings.improvement_areas)
+        )
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "quality_score": self.quality_score,
+            "num_suggestions": self.num_suggestions,
+            "num_bugs": self.num_bugs,
+            "num_improvements": self.num_improvements
+        }
+
+
+@dataclass
+class ReviewRecord:
+    """One entry of the review history"""
+
+    __slots__ = ("code", "language", "prompt_version", "review_results", "metrics", "timestamp")
+    code: str
+    language: str
+    prompt_version: str
+    review_results: ReviewFindings
+    metrics: ReviewMetrics
+    timestamp: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReviewRecord":
+        findings = ReviewFindings.from_dict(data["review_results"])
+        return cls(
+            data["code"],
+            data["language"],
+            data.get("prompt_version", "default"),
+            findings,
+            ReviewMetrics.from_findings(findings),
+            data["timestamp"]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "code": self.code,
+            "language": self.language,
+            "prompt_version": self.prompt_version,
+            "review_results": self.review_results,
+            "metrics": self.metrics,
+            "timestamp": self.timestamp
+        }
+
+
+def as_findings(results: Union[ReviewFindings, Dict[str, Any]]) -> ReviewFindings:
+    return results if isinstance(results, ReviewFindings) else ReviewFindings.from_dict(results)
+
+
+def _default(obj: Any) -> Any:
+    # Explicit to_dict() beats orjson's generic __slots__ dataclass walk by ~2x
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if dataclasses.is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from backend.app.services.rate_limiter import RateLimiter
+from backend.app.services.serialization import ReviewFindings, dumps, loads
+
+
+# How long a rate-limit transaction waits for another worker's write lock. Admission
+# runs on the event loop, so this bounds how long contention can stall a worker.
+LIMITER_BUSY_TIMEOUT = 0.05
+# Delay before a scheduler retries an admission that lost the lock race
+LIMITER_LOCKED_RETRY = 0.01
+
+
+def _connect(path: str, busy_timeout: float = 5.0) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode so many worker processes can share it"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class _SQLiteStore:
+    """One connection per process, reopened after fork and guarded by a lock"""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._db_lock = threading.Lock()
+        self._pid = None
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None or self._pid != os.getpid():
+            db = _connect(self.path, self.busy_timeout)
+            try:
+                self._init_schema(db)
+            except sqlite3.Error:
+                # Retry the schema on the next call rather than keep a half-initialised store
+                db.close()
+                raise
+            self._db, self._pid = db, os.getpid()
+        return self._db
+
+    def _init_schema(self, db: sqlite3.Connection):
+        pass
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, serialising read-modify-write across processes
+        with self._db_lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+
+class SQLiteReviewCache(_SQLiteStore):
+    """Review results shared by every worker, keyed by the normalized request hash.
+
+    Calls block on SQLite; async callers run them in a thread (``asyncio.to_thread``).
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 3600):
+        super().__init__(path)
+        self.ttl = ttl
+
+    def _init_schema(self, db: sqlite3.Connection):
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS review_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[ReviewFindings]:
+        with self._db_lock:
+            row = self._connection().execute(
+                "SELECT value FROM review_cache WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return ReviewFindings.from_dict(loads(row[0])) if row else None
+
+    def set(self, key: str, findings: ReviewFindings):
+        with self._db_lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO review_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, dumps(findings), time.time() + self.ttl)
+            )
+
+    def purge_expired(self) -> int:
+        with self._db_lock:
+            return self._connection().execute(
+                "DELETE FROM review_cache WHERE expires <= ?", (time.time(),)
+            ).rowcount
+
+
+class SharedRateLimiter(_SQLiteStore, RateLimiter):
+    """RateLimiter whose buckets live in SQLite so all workers draw from one provider quota.
+
+    Each admission loads the buckets, applies the usual TokenBucket arithmetic and
+    writes them back inside one write transaction. Wall-clock time is used since
+    monotonic clocks are not comparable across processes.
+
+    These calls run on the event loop (FairScheduler), so the lock wait is capped at
+    LIMITER_BUSY_TIMEOUT. An admission that can't get the lock in time reports a
+    short wait and is retried by the scheduler; the other updates are best-effort
+    and skipped under contention (a lost refund only makes the bucket stricter,
+    and the next response or 429 re-syncs limits and pauses).
+    """
+
+    _clock = staticmethod(time.time)
+
+    def __init__(self, path: str, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        RateLimiter.__init__(self, rpm, tpm)
+        _SQLiteStore.__init__(self, path, busy_timeout=LIMITER_BUSY_TIMEOUT)
+
+    def _init_schema(self, db: sqlite3.Connection):
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "name TEXT PRIMARY KEY, per_minute REAL, tokens REAL, updated REAL)"
+        )
+        now = time.time()
+        for name, bucket in self._buckets():
+            db.execute(
+                "INSERT OR IGNORE INTO rate_buckets VALUES (?, ?, ?, ?)",
+                (name, bucket.per_minute, bucket.capacity, now)
+            )
+        # The 'paused' row keeps the 429 pause deadline in its updated column
+        db.execute("INSERT OR IGNORE INTO rate_buckets VALUES ('paused', 0, 0, 0)")
+
+    def _buckets(self):
+        return (("requests", self.requests), ("tokens", self.tokens))
+
+    def _load(self, db: sqlite3.Connection):
+        rows = {row[0]: row[1:] for row in db.execute("SELECT * FROM rate_buckets")}
+        for name, bucket in self._buckets():
+            bucket.per_minute, bucket.tokens, bucket.updated = rows[name]
+            bucket.capacity = bucket.per_minute
+        self.paused_until = rows["paused"][2]
+
+    def _store(self, db: sqlite3.Connection):
+        for name, bucket in self._buckets():
+            db.execute(
+                "UPDATE rate_buckets SET per_minute = ?, tokens = ?, updated = ? WHERE name = ?",
+                (bucket.per_minute, bucket.tokens, bucket.updated, name)
+            )
+        db.execute("UPDATE rate_buckets SET updated = ? WHERE name = 'paused'", (self.paused_until,))
+
+    def _shared(method, locked_result=None):
+        """Run a RateLimiter method against the buckets stored in SQLite"""
+        def wrapper(self, *args, **kwargs):
+            try:
+                with self._transaction() as db:
+                    self._load(db)
+                    result = method(self, *args, **kwargs)
+                    self._store(db)
+                    return result
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+                return locked_result
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    try_acquire = _shared(RateLimiter.try_acquire, locked_result=LIMITER_LOCKED_RETRY)
+    reconcile = _shared(RateLimiter.reconcile)
+    on_rate_limited = _shared(RateLimiter.on_rate_limited)
+    update_from_headers = _shared(RateLimiter.update_from_headers)
+    del _shared
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mlops.monitoring.setup_monitoring import COALESCED_REQUESTS
+
+
+def _normalize_code(code: str) -> str:
+    """Normalize line endings and trailing whitespace so cosmetic diffs share a key"""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def request_key(code: str,
+                language: str,
+                context: Optional[str] = None,
+                prompt_version: str = "default",
+                model: str = "") -> str:
+    """Hash of a normalized review request, used to detect identical in-flight reviews"""
+    payload = {
+        "code": _normalize_code(code),
+        "language": language.strip().lower(),
+        "context": (context or "").strip(),
+        "prompt_version": prompt_version,
+        "model": model
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class _Flight:
+    """One shared task and the number of callers currently awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical coroutine calls onto one shared task.
+
+    The first caller for a key starts the task; duplicates arriving while it runs
+    await the same task. A cancelled waiter only detaches itself - the shared task
+    is cancelled once every waiter has gone away, and its key is released at once.
+    Exceptions reach every waiter and the key is released on completion, so the
+    next call after a failure retries.
+    """
+
+    def __init__(self, name: str = "backend"):
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Waiters hold on to their own flight, so a later flight for the same key
+        # never sees their bookkeeping
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._release(key, flight))
+        else:
+            COALESCED_REQUESTS.labels(path=self.name).inc()
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # The task may take a while to unwind (closing the upstream stream);
+                # release the key now so a new caller starts a fresh flight instead
+                # of joining one that is being cancelled
+                self._release(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _release(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+class SingleFlight:
+    """Thread-based counterpart of AsyncSingleFlight for the Streamlit path.
+
+    The first thread for a key runs ``fn`` itself; concurrent duplicates block on a
+    shared future and receive the same result or exception.
+    """
+
+    def __init__(self, name: str = "streamlit"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._futures[key] = future
+
+        if not leader:
+            COALESCED_REQUESTS.labels(path=self.name).inc()
+            return future.result(timeout=timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._futures)
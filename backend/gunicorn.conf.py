@@ -0,0 +1,34 @@
+# Multi-worker deployment of the review API. Run from the repository root:
+#
+#     gunicorn -c backend/gunicorn.conf.py backend.app.main:app
+#
+# Workers share the review cache and rate-limit buckets through SQLite (WAL) files in
+# SHARED_STATE_DIR and write Prometheus samples to PROMETHEUS_MULTIPROC_DIR, which
+# /metrics aggregates across all of them.
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+
+state_dir = os.environ.setdefault(
+    "SHARED_STATE_DIR", os.path.join(tempfile.gettempdir(), "code-review-state")
+)
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(state_dir, "prometheus")
+)
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be aggregated into this one
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
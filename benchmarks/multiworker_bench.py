@@ -0,0 +1,106 @@
+"""Measure /api/review throughput as gunicorn workers are added.
+
+The in-process ``scorer`` backend stands in for the LLM, so each request costs only
+the API's own CPU work (validation, cache lookup, rate-limit transaction, scoring,
+encoding) and throughput should scale with cores. Every request carries unique code
+so the shared review cache never short-circuits it.
+
+Run from the repository root (requires gunicorn, uvicorn and httpx):
+
+    python -m benchmarks.multiworker_bench --workers 1 2 4 8 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8765
+URL = f"http://127.0.0.1:{PORT}"
+
+
+async def _load(client_id: int, concurrency: int, duration: float) -> int:
+    done = 0
+    deadline = time.monotonic() + duration
+
+    async def loop(slot: int):
+        nonlocal done
+        i = 0
+        async with httpx.AsyncClient(base_url=URL, timeout=30) as client:
+            while time.monotonic() < deadline:
+                code = f"def f_{client_id}_{slot}_{i}(x):\n    return x * {i}\n"
+                response = await client.post("/api/review", json={"code": code, "language": "python"})
+                response.raise_for_status()
+                done += 1
+                i += 1
+
+    await asyncio.gather(*(loop(slot) for slot in range(concurrency)))
+    return done
+
+
+def _client(args) -> int:
+    return asyncio.run(_load(*args))
+
+
+def _wait_healthy(timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{URL}/api/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API did not become healthy")
+
+
+def run(workers: int, clients: int, concurrency: int, duration: float) -> float:
+    state_dir = tempfile.mkdtemp(prefix="review-bench-")
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(workers),
+        BIND=f"127.0.0.1:{PORT}",
+        SHARED_STATE_DIR=state_dir,
+        PROMETHEUS_MULTIPROC_DIR=os.path.join(state_dir, "prometheus"),
+        MODEL_BACKENDS="scorer",
+        LLM_RPM="1e9",
+        LLM_TPM="1e12"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "backend/gunicorn.conf.py", "backend.app.main:app"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        _wait_healthy()
+        with multiprocessing.Pool(clients) as pool:
+            completed = sum(pool.map(_client, [(c, concurrency, duration) for c in range(clients)]))
+        return completed / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cores = multiprocessing.cpu_count()
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, max(cores // 2, 1), cores}))
+    parser.add_argument("--clients", type=int, default=max(cores // 2, 1), help="load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="in-flight requests per client")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        throughput = run(workers, args.clients, args.concurrency, args.duration)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {throughput:>10,.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the dict/json review path against slotted records + orjson.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization_bench
+"""
+import gc
+import json
+import timeit
+import tracemalloc
+
+from backend.app.services.serialization import ReviewFindings, dumps, loads, orjson
+
+try:
+    from pydantic import BaseModel
+except ImportError:
+    BaseModel = None
+
+N = 50_000
+
+
+def sample_dict(i: int) -> dict:
+    return {
+        "suggestions": ["Consider adding type hints", f"Add docstring to function {i}"],
+        "quality_score": 0.85,
+        "potential_bugs": [f"Possible null reference in line {i}"],
+        "improvement_areas": ["Code organization", "Error handling"]
+    }
+
+
+def bench(label: str, fn, n: int = N):
+    gc.collect()
+    elapsed = min(timeit.repeat(fn, number=1, repeat=5))
+    print(f"{label:<40} {n / elapsed:>12,.0f} records/s")
+
+
+def memory_per_record(factory) -> float:
+    tracemalloc.start()
+    records = [factory(i) for i in range(N)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current / N
+
+
+def main():
+    dicts = [sample_dict(i) for i in range(N)]
+    records = [ReviewFindings.from_dict(d) for d in dicts]
+
+    print(f"encoder: {'orjson' if orjson is not None else 'stdlib json'}, {N:,} records\n")
+
+    if BaseModel is not None:
+        class CodeReviewResponse(BaseModel):
+            suggestions: list
+            quality_score: float
+            potential_bugs: list
+            improvement_areas: list
+
+        bench("encode: pydantic model + json.dumps",
+              lambda: [json.dumps(CodeReviewResponse(**d).model_dump()).encode() for d in dicts])
+    bench("encode: dict + json.dumps", lambda: [json.dumps(d).encode() for d in dicts])
+    bench("encode: ReviewFindings + dumps", lambda: [dumps(r) for r in records])
+
+    payloads = [json.dumps(d).encode() for d in dicts]
+    bench("decode: json.loads", lambda: [json.loads(p) for p in payloads])
+    bench("decode: loads + ReviewFindings", lambda: [ReviewFindings.from_dict(loads(p)) for p in payloads])
+
+    # Both factories share the same string lists so only the container overhead differs
+    shared = sample_dict(0)
+    print()
+    for label, factory in (
+        ("memory: dict", lambda i: dict(shared)),
+        ("memory: ReviewFindings", lambda i: ReviewFindings(*shared.values())),
+    ):
+        print(f"{label:<40} {memory_per_record(factory):>12,.0f} bytes/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DATA_PATH = "data/processed/results_analytics.csv"
+FEATURE_CACHE_DIR = "data/features"
+
+FEATURE_NAMES = [
+    'code_length',
+    'line_count',
+    'function_count',
+    'class_count',
+    'loop_count',
+    'condition_count',
+    'comment_count',
+    'variable_count',
+    'whitespace_ratio',
+    'max_line_length',
+    'avg_line_length',
+    'max_indentation_depth'
+]
+
+# Same patterns as the feature engineering section of AI_Code_Review.ipynb, compiled once
+FUNCTION_PATTERNS = [re.compile(p) for p in [
+    r'\bdef\s+\w+\s*\(',  # Python
+    r'\bfunction\s+\w+\s*\(',  # JavaScript
+    r'\b(public|private|protected|static)?\s+\w+\s+\w+\s*\([^)]*\)\s*({|throws)',  # Java methods
+    r'\b(void|int|float|double|String|boolean|char|byte|short|long)\s+\w+\s*\([^)]*\)\s*{',  # Java/C-style
+    r'\b\w+\s*\([^)]*\)\s*=>\s*{'  # Arrow functions
+]]
+CLASS_PATTERN = re.compile(r'\bclass\s+\w+')
+LOOP_PATTERNS = [re.compile(p) for p in [
+    r'\bfor\s*\(', r'\bwhile\s*\(', r'\bdo\s*{', r'\bfor\s+\w+\s+in\b', r'\bforeach\s*\('
+]]
+CONDITION_PATTERNS = [re.compile(p) for p in [
+    r'\bif\s*\(', r'\belse\s+if\s*\(', r'\belse\s*{', r'\bswitch\s*\(', r'\bcase\s+', r'\bcase\s*:', r'\bdefault\s*:'
+]]
+COMMENT_PATTERNS = [re.compile(p, re.MULTILINE) for p in [r'\/\/.*?$', r'#.*?$', r'\/\*[\s\S]*?\*\/']]
+VARIABLE_PATTERNS = [re.compile(p) for p in [
+    r'\b(var|let|const)\s+\w+\s*=',  # JavaScript
+    r'\b(int|float|double|char|String|boolean|long|short|byte)\s+\w+\s*[=;]',  # Java/C-style
+    r'\b\w+\s*=\s*[^=]'  # Python and others
+]]
+
+
+def _count(patterns: List[re.Pattern], text: str) -> int:
+    return sum(len(pattern.findall(text)) for pattern in patterns)
+
+
+def extract_code_features(code_text) -> List[float]:
+    """Extract meaningful features from code text, in FEATURE_NAMES order"""
+    if not isinstance(code_text, str):
+        return [0.0] * len(FEATURE_NAMES)
+
+    code_length = len(code_text)
+    lines = code_text.split('\n')
+    line_count = len(lines)
+
+    whitespace = sum(1 for c in code_text if c.isspace())
+    non_empty_lines = [line for line in lines if line.strip()]
+    indentation = [len(line) - len(line.lstrip()) for line in non_empty_lines]
+
+    return [
+        code_length,
+        line_count,
+        _count(FUNCTION_PATTERNS, code_text),
+        len(CLASS_PATTERN.findall(code_text)),
+        _count(LOOP_PATTERNS, code_text),
+        _count(CONDITION_PATTERNS, code_text),
+        _count(COMMENT_PATTERNS, code_text),
+        _count(VARIABLE_PATTERNS, code_text),
+        whitespace / code_length if code_length > 0 else 0,
+        max((len(line) for line in lines), default=0),
+        sum(len(line) for line in lines) / line_count if line_count > 0 else 0,
+        max(indentation, default=0) // 4  # assuming 4-space tabs
+    ]
+
+
+def build_feature_matrix(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Feature matrix and has_bugs labels for a code review dataset"""
+    X = np.array([extract_code_features(code) for code in data['code']], dtype=np.float64)
+    y = data['has_bugs'].astype(np.int64).to_numpy()
+    return X, y
+
+
+def data_version(path: str) -> str:
+    """Content hash of the dataset file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def feature_code_hash() -> str:
+    """Hash of this module's source, so editing the extractor invalidates cached features"""
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def feature_cache_path(data_path: str, cache_dir: str = FEATURE_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"{data_version(data_path)}-{feature_code_hash()}")
+
+
+def load_feature_matrix(data_path: str = DEFAULT_DATA_PATH,
+                        cache_dir: str = FEATURE_CACHE_DIR) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """Memory-mapped (X, y) for ``data_path``, extracting and caching the features on first use.
+
+    The cache directory is keyed by data version and feature-code hash. Arrays are
+    opened read-only with ``mmap_mode='r'``, so every process that loads them shares
+    the same page-cache pages instead of holding its own copy.
+    """
+    path = feature_cache_path(data_path, cache_dir)
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        X, y = build_feature_matrix(pd.read_csv(data_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=cache_dir)
+        np.save(os.path.join(staging, 'X.npy'), X)
+        np.save(os.path.join(staging, 'y.npy'), y)
+        with open(os.path.join(staging, 'meta.json'), 'w') as f:
+            json.dump({
+                'data_path': data_path,
+                'data_version': data_version(data_path),
+                'feature_code_hash': feature_code_hash(),
+                'feature_names': FEATURE_NAMES,
+                'rows': int(X.shape[0])
+            }, f)
+        try:
+            os.replace(staging, path)
+        except OSError:
+            # Another process published the same features first
+            shutil.rmtree(staging, ignore_errors=True)
+
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    meta['path'] = path
+    X = np.load(os.path.join(path, 'X.npy'), mmap_mode='r')
+    y = np.load(os.path.join(path, 'y.npy'), mmap_mode='r')
+    return X, y, meta
@@ -1,21 +1,32 @@
 import mlflow
 import pandas as pd
-from datetime import datetime
-import json
+from datetime import datetime, timedelta
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+from backend.app.services.serialization import (
+    ReviewFindings, ReviewMetrics, ReviewRecord, as_findings, dumps, loads
+)
+
+HISTORY_COLUMNS = [
+    "timestamp", "language", "prompt_version",
+    "quality_score", "num_suggestions", "num_bugs", "num_improvements"
+]
 
 class MetricsTracker:
-    def __init__(self):
+    def __init__(self, history_path: str = "review_history.jsonl"):
         mlflow.set_tracking_uri("file:./mlruns")
         mlflow.set_experiment("code_review_metrics")
+        self.history_path = history_path
 
     def log_review_metrics(self, 
                           code: str, 
                           language: str, 
-                          review_results: Dict[str, Any],
+                          review_results: Union[ReviewFindings, Dict[str, Any]],
                           prompt_version: str = "default"):
         """Log metrics for a code review"""
+        findings = as_findings(review_results)
+        metrics = ReviewMetrics.from_findings(findings)
         with mlflow.start_run(run_name=f"review_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
             # Log parameters
             mlflow.log_params({
@@ -25,30 +36,41 @@ class MetricsTracker:
             })
 
             # Log metrics
-            metrics = {
-                "quality_score": review_results.get("quality_score", 0),
-                "num_suggestions": len(review_results.get("suggestions", [])),
-                "num_bugs": len(review_results.get("potential_bugs", [])),
-                "num_improvements": len(review_results.get("improvement_areas", []))
-            }
-            mlflow.log_metrics(metrics)
+            mlflow.log_metrics(metrics.to_dict())
 
             # Log artifacts
-            review_data = {
-                "code": code,
-                "language": language,
-                "review_results": review_results,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            with open("review_data.json", "w") as f:
-                json.dump(review_data, f)
+            record = ReviewRecord(
+                code, language, prompt_version, findings, metrics, datetime.now().isoformat()
+            )
+            review_data = dumps(record)
+
+            with open("review_data.json", "wb") as f:
+                f.write(review_data)
             mlflow.log_artifact("review_data.json")
 
+        # Append to the local history store, one JSON record per line
+        with open(self.history_path, "ab") as f:
+            f.write(review_data + b"\n")
+
     def get_historical_metrics(self, days: int = 7) -> pd.DataFrame:
         """Retrieve historical metrics for analysis"""
-        # TODO: Implement historical metrics retrieval
-        pass
+        if not os.path.exists(self.history_path):
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        rows = []
+        with open(self.history_path, "rb") as f:
+            for line in f:
+                data = loads(line)
+                if data["timestamp"] < cutoff:
+                    continue
+                metrics = data["metrics"]
+                rows.append((
+                    data["timestamp"], data["language"], data["prompt_version"],
+                    metrics["quality_score"], metrics["num_suggestions"],
+                    metrics["num_bugs"], metrics["num_improvements"]
+                ))
+        return pd.DataFrame.from_records(rows, columns=HISTORY_COLUMNS)
 
     def compare_prompt_versions(self, version1: str, version2: str) -> Dict[str, Any]:
         """Compare metrics between two prompt versions"""
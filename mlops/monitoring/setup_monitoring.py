@@ -1,4 +1,5 @@
-from prometheus_client import start_http_server, Counter, Gauge, Histogram
+from prometheus_client import start_http_server, Counter, Gauge, Histogram, CollectorRegistry, REGISTRY, multiprocess
+import os
 import time
 import logging
 from typing import Dict, Any
@@ -19,7 +20,8 @@ REVIEW_COUNTER = Counter(
 QUALITY_SCORE = Gauge(
     'code_quality_score',
     'Code quality score from reviews',
-    ['language']
+    ['language'],
+    multiprocess_mode='mostrecent'
 )
 
 REVIEW_DURATION = Histogram(
@@ -28,10 +30,40 @@ REVIEW_DURATION = Histogram(
     ['language']
 )
 
+COALESCED_REQUESTS = Counter(
+    'code_reviews_coalesced_total',
+    'Review requests served by an identical in-flight review instead of a new LLM call',
+    ['path']
+)
+
+REVIEW_CACHE_HITS = Counter(
+    'code_review_cache_hits_total',
+    'Review requests answered from the shared review cache'
+)
+
+CANCELLED_REVIEWS = Counter(
+    'code_reviews_cancelled_total',
+    'Reviews abandoned before completion, by reason (client disconnect or expired deadline)',
+    ['reason']
+)
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose; aggregates all worker processes when PROMETHEUS_MULTIPROC_DIR is set"""
+    if not os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
 class MonitoringService:
     def __init__(self, port: int = 8000):
         self.port = port
-        start_http_server(port)
+        try:
+            start_http_server(port, registry=metrics_registry())
+        except OSError as e:
+            # Another process (e.g. a sibling worker) already serves metrics on this port
+            logger.warning(f"Could not start Prometheus metrics server on port {port}: {e}")
+            return
         logger.info(f"Started Prometheus metrics server on port {port}")
 
     def log_review(self, language: str, quality_score: float, duration: float):
@@ -52,6 +84,14 @@ class MonitoringService:
             'quality_scores': {
                 label: gauge._value.get()
                 for label, gauge in QUALITY_SCORE._metrics.items()
+            },
+            'coalesced_requests': {
+                label: counter._value.get()
+                for label, counter in COALESCED_REQUESTS._metrics.items()
+            },
+            'cancelled_reviews': {
+                label: counter._value.get()
+                for label, counter in CANCELLED_REVIEWS._metrics.items()
             }
         }
 
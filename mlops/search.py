@@ -0,0 +1,237 @@
+"""Parallel hyperparameter search over the cached code-feature matrix.
+
+Features are extracted once (see mlops/features.py) and memory-mapped by every
+worker; candidate configurations are cross-validated in parallel and each one is
+logged as a nested MLflow run under a single search run.
+
+    python -m mlops.search                           # parallel search
+    python -m mlops.search --mode serial             # notebook baseline: extract once, fit one at a time
+    python -m mlops.search --mode serial-reextract   # re-extract features for every trial
+    python -m mlops.search --compare                 # run all three, report wall clock and peak memory
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, cross_validate
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from mlops.features import DEFAULT_DATA_PATH, build_feature_matrix, load_feature_matrix
+
+RANDOM_SEED = 42
+
+SEARCH_SPACE = {
+    'RandomForest': {
+        'n_estimators': [100, 300],
+        'max_depth': [None, 8]
+    },
+    'GradientBoosting': {
+        'n_estimators': [100, 200],
+        'learning_rate': [0.05, 0.1]
+    },
+    'LogisticRegression': {
+        'C': [0.1, 1.0, 10.0]
+    }
+}
+
+SCORING = ['accuracy', 'precision', 'recall', 'f1']
+
+# Set in each worker by _init_worker
+_X = None
+_y = None
+
+
+def make_model(model_type: str, params: Dict[str, Any]):
+    if model_type == 'RandomForest':
+        return RandomForestClassifier(random_state=RANDOM_SEED, **params)
+    if model_type == 'GradientBoosting':
+        return GradientBoostingClassifier(random_state=RANDOM_SEED, **params)
+    if model_type == 'LogisticRegression':
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, **params))
+    raise ValueError(f"Unknown model type: {model_type}")
+
+
+def candidate_configs() -> List[Tuple[str, Dict[str, Any]]]:
+    return [(model_type, params) for model_type, grid in SEARCH_SPACE.items() for params in ParameterGrid(grid)]
+
+
+def evaluate(model_type: str, params: Dict[str, Any], X: np.ndarray, y: np.ndarray, folds: int) -> Dict[str, float]:
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=RANDOM_SEED)
+    scores = cross_validate(make_model(model_type, params), X, y, cv=cv, scoring=SCORING, n_jobs=1)
+    return {metric: float(np.mean(scores[f'test_{metric}'])) for metric in SCORING}
+
+
+def _init_worker(x_path: str, y_path: str):
+    # Workers map the cached arrays instead of receiving pickled copies
+    global _X, _y
+    _X = np.load(x_path, mmap_mode='r')
+    _y = np.load(y_path, mmap_mode='r')
+
+
+def _run_trial(model_type: str, params: Dict[str, Any], folds: int) -> Tuple[str, Dict[str, Any], Dict[str, float], float]:
+    started = time.perf_counter()
+    metrics = evaluate(model_type, params, _X, _y, folds)
+    return model_type, params, metrics, time.perf_counter() - started
+
+
+def peak_memory_mb() -> Dict[str, float]:
+    # ru_maxrss is in KiB on Linux; RUSAGE_CHILDREN reports the largest single child
+    return {
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'peak_worker_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    }
+
+
+def _log_trial(model_type: str, params: Dict[str, Any], metrics: Dict[str, float], duration: float):
+    with mlflow.start_run(run_name=f"{model_type}_{'_'.join(f'{k}={v}' for k, v in params.items())}", nested=True):
+        mlflow.log_params({'model_type': model_type, **params})
+        mlflow.log_metrics({**metrics, 'fit_seconds': duration})
+
+
+def run_parallel(data_path: str, folds: int, workers: int) -> List[Tuple[str, Dict[str, Any], Dict[str, float], float]]:
+    X, y, meta = load_feature_matrix(data_path)
+    mlflow.log_params({
+        'data_version': meta['data_version'],
+        'feature_code_hash': meta['feature_code_hash'],
+        'rows': meta['rows']
+    })
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(X.filename, y.filename)
+    ) as pool:
+        futures = [pool.submit(_run_trial, model_type, params, folds) for model_type, params in candidate_configs()]
+        for future in as_completed(futures):
+            result = future.result()
+            _log_trial(*result)
+            results.append(result)
+    return results
+
+
+def run_serial(data_path: str, folds: int) -> List[Tuple[str, Dict[str, Any], Dict[str, float], float]]:
+    """Baseline from AI_Code_Review.ipynb: extract features once, then fit each candidate in turn"""
+    X, y = build_feature_matrix(pd.read_csv(data_path))
+    results = []
+    for model_type, params in candidate_configs():
+        started = time.perf_counter()
+        metrics = evaluate(model_type, params, X, y, folds)
+        result = (model_type, params, metrics, time.perf_counter() - started)
+        _log_trial(*result)
+        results.append(result)
+    return results
+
+
+def run_serial_reextract(data_path: str, folds: int) -> List[Tuple[str, Dict[str, Any], Dict[str, float], float]]:
+    """Every trial re-reads the data and re-extracts features, as separate training runs would"""
+    results = []
+    for model_type, params in candidate_configs():
+        started = time.perf_counter()
+        X, y = build_feature_matrix(pd.read_csv(data_path))
+        metrics = evaluate(model_type, params, X, y, folds)
+        result = (model_type, params, metrics, time.perf_counter() - started)
+        _log_trial(*result)
+        results.append(result)
+    return results
+
+
+RUNNERS = {
+    'parallel': run_parallel,
+    'serial': run_serial,
+    'serial-reextract': run_serial_reextract
+}
+
+
+def search(data_path: str, mode: str, folds: int, workers: int) -> Dict[str, Any]:
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "file:./mlruns"))
+    mlflow.set_experiment("code_review_model_search")
+
+    started = time.perf_counter()
+    with mlflow.start_run(run_name=f"search_{mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
+        mlflow.log_params({'mode': mode, 'folds': folds, 'workers': workers if mode == 'parallel' else 1})
+        if mode == 'parallel':
+            results = run_parallel(data_path, folds, workers)
+        else:
+            results = RUNNERS[mode](data_path, folds)
+
+        best_type, best_params, best_metrics, _ = max(results, key=lambda r: r[2]['f1'])
+        summary = {
+            'mode': mode,
+            'trials': len(results),
+            'wall_clock_seconds': time.perf_counter() - started,
+            **peak_memory_mb(),
+            'best_model': best_type,
+            'best_params': best_params,
+            'best_f1': best_metrics['f1']
+        }
+        mlflow.log_metrics({
+            'wall_clock_seconds': summary['wall_clock_seconds'],
+            'peak_rss_mb': summary['peak_rss_mb'],
+            'peak_worker_rss_mb': summary['peak_worker_rss_mb'],
+            'best_f1': best_metrics['f1']
+        })
+        mlflow.set_tag('best_model', f"{best_type} {best_params}")
+    return summary
+
+
+def compare(data_path: str, folds: int, workers: int):
+    """Run each mode in a fresh process so their peak-memory figures don't mix.
+
+    Speedups are relative to the ``serial`` baseline, which extracts features only
+    once, so the parallel figure reflects parallel fitting alone.
+    """
+    summaries = []
+    for mode in ('serial', 'serial-reextract', 'parallel'):
+        output = subprocess.run(
+            [sys.executable, '-m', 'mlops.search', '--mode', mode, '--data', data_path,
+             '--folds', str(folds), '--workers', str(workers), '--json'],
+            check=True, capture_output=True, text=True
+        ).stdout
+        summaries.append(json.loads(output.strip().splitlines()[-1]))
+
+    baseline = summaries[0]['wall_clock_seconds']
+    print(f"{'mode':<17} {'trials':>6} {'wall clock':>11} {'vs serial':>10} {'peak RSS':>10} {'peak worker RSS':>16}")
+    for s in summaries:
+        print(f"{s['mode']:<17} {s['trials']:>6} {s['wall_clock_seconds']:>10.2f}s "
+              f"{baseline / s['wall_clock_seconds']:>9.2f}x "
+              f"{s['peak_rss_mb']:>8.0f}MB {s['peak_worker_rss_mb']:>14.0f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter search for the bug classifier")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--mode', choices=list(RUNNERS), default='parallel')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--compare', action='store_true', help='run every mode and compare them')
+    parser.add_argument('--json', action='store_true', help='print the summary as JSON')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.data, args.folds, args.workers)
+        return
+
+    summary = search(args.data, args.mode, args.folds, args.workers)
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        for key, value in summary.items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,11 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 import os
 from datetime import datetime
 
-def load_data():
-    # TODO: Implement data loading from your code review dataset
-    # This is a placeholder implementation
-    return pd.DataFrame({
-        'code': ['sample code 1', 'sample code 2'],
-        'quality_score': [0.8, 0.6],
-        'has_bugs': [0, 1]
-    })
+from mlops.features import DEFAULT_DATA_PATH, load_feature_matrix
+
+def load_data(data_path: str = DEFAULT_DATA_PATH):
+    # Code features are extracted once per data version and shared with mlops/search.py
+    return load_feature_matrix(data_path)
 
 def train_model(X_train, y_train):
     # TODO: Implement your model training logic
@@ -39,9 +36,7 @@ def main():
     mlflow.set_experiment("code_review_model")
 
     # Load and prepare data
-    data = load_data()
-    X = data[['code']]  # Add your feature engineering here
-    y = data['has_bugs']
+    X, y, meta = load_data()
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
 
     with mlflow.start_run():
@@ -54,7 +49,9 @@ def main():
         # Log parameters
         mlflow.log_params({
             'model_type': 'RandomForest',
-            'test_size': 0.2
+            'test_size': 0.2,
+            'data_version': meta['data_version'],
+            'feature_code_hash': meta['feature_code_hash']
         })
 
         # Log metrics
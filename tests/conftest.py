@@ -0,0 +1,204 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import pandas as pd
+import pytest
+
+
+# Refill time the server quota gives away to absorb client-to-server transit,
+# which includes opening dozens of connections at once on a busy test machine
+TRANSIT_SLACK = 0.5
+
+
+class _Bucket:
+    """Server-side quota that refills continuously, as the hosted providers do"""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+        missing = amount - self.tokens - TRANSIT_SLACK * self.per_minute / 60
+        return 0.0 if missing <= 0 else missing * 60 / self.per_minute
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Tests open dozens of connections at once
+    request_queue_size = 256
+
+
+class MockLLMServer:
+    """Local OpenAI-compatible chat-completions server for tests.
+
+    Enforces its own RPM/TPM quota, answering over-quota requests with 429 and
+    ``retry-after``, and advertises the quota in ``x-ratelimit-limit-*`` headers.
+    ``first_token_delay`` injects latency before the first streamed chunk,
+    ``throttle_next`` forces that many 429s and ``fail_status`` makes every
+    request fail with that status. ``dropped`` counts streams the client closed
+    before the reply was finished.
+    """
+
+    def __init__(self,
+                 rpm: float = 1e9,
+                 tpm: float = 1e12,
+                 reply: str = "Looks good to me.",
+                 first_token_delay: float = 0.0,
+                 retry_after: float = 1.0,
+                 fail_status: Optional[int] = None):
+        self.requests_bucket = _Bucket(rpm)
+        self.tokens_bucket = _Bucket(tpm)
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.retry_after = retry_after
+        self.fail_status = fail_status
+        self.throttle_next = 0
+        self.dropped = 0
+        # (monotonic arrival time, last message content, status) per request
+        self.log: List[tuple] = []
+        self._lock = threading.Lock()
+
+        self._httpd = _HTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def statuses(self) -> List[int]:
+        with self._lock:
+            return [status for *_, status in self.log]
+
+    def prompts(self, status: int = 200) -> List[str]:
+        with self._lock:
+            return [prompt for _, prompt, s in self.log if s == status]
+
+    def start(self) -> "MockLLMServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _admit(self, body: dict):
+        """Status and retry-after for one request, charging the quota when admitted"""
+        cost = sum(len(m["content"]) for m in body["messages"]) // 4 + body.get("max_tokens", 0)
+        with self._lock:
+            if self.fail_status is not None:
+                status, retry_after = self.fail_status, None
+            elif self.throttle_next > 0:
+                self.throttle_next -= 1
+                status, retry_after = 429, self.retry_after
+            else:
+                wait = max(self.requests_bucket.wait_time(1), self.tokens_bucket.wait_time(cost))
+                if wait > 0:
+                    status, retry_after = 429, wait
+                else:
+                    self.requests_bucket.tokens -= 1
+                    self.tokens_bucket.tokens -= cost
+                    status, retry_after = 200, None
+            self.log.append((time.monotonic(), body["messages"][-1]["content"], status))
+        return status, retry_after, cost
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def client_gone(self) -> bool:
+                try:
+                    return self.connection.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+                except BlockingIOError:
+                    return False
+                except OSError:
+                    return True
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, retry_after, cost = server._admit(body)
+
+                self.send_response(status)
+                self.send_header("x-ratelimit-limit-requests", f"{server.requests_bucket.per_minute:g}")
+                self.send_header("x-ratelimit-limit-tokens", f"{server.tokens_bucket.per_minute:g}")
+                if status != 200:
+                    payload = json.dumps({"error": {"message": f"status {status}", "type": "mock"}}).encode()
+                    if retry_after is not None:
+                        self.send_header("retry-after", f"{retry_after:.3f}")
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                self.wfile.flush()
+                try:
+                    # Like a real provider, stop generating once the client hangs up
+                    first_token_at = time.monotonic() + server.first_token_delay
+                    while time.monotonic() < first_token_at:
+                        if self.client_gone():
+                            raise ConnectionResetError()
+                        time.sleep(min(0.02, max(first_token_at - time.monotonic(), 0)))
+                    for word in server.reply.split(" "):
+                        chunk = {
+                            "id": "mock", "object": "chat.completion.chunk", "created": 0,
+                            "model": body["model"],
+                            "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]
+                        }
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    with server._lock:
+                        server.dropped += 1
+                # Bill actual usage, like the client-side reconcile assumes
+                actual = sum(len(m["content"]) for m in body["messages"]) // 4 + len(server.reply) // 4
+                with server._lock:
+                    server.tokens_bucket.tokens += cost - actual
+
+        return Handler
+
+
+@pytest.fixture
+def mock_llm():
+    """Factory for started MockLLMServer instances, stopped after the test"""
+    servers = []
+
+    def start(**config) -> MockLLMServer:
+        server = MockLLMServer(**config).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def review_dataset(tmp_path) -> str:
+    """Small CSV with the code/has_bugs columns of data/processed/results_analytics.csv"""
+    rows = [
+        ("def add(a, b):\n    return a + b\n", 0),
+        ("for i in range(10):\n    total = total + i\n", 1),
+        ("class Box:\n    def get(self):\n        return self.value\n", 0),
+        ("if (x) {\n  y = x / 0;\n}\n", 1),
+        ("# parse the header\nname = line.split(':')[0]\n", 0),
+        ("while (true) {\n  count++;\n}\n", 1),
+        ("function greet(name) {\n  return 'hi ' + name;\n}\n", 0),
+        ("data = open(path).read()\nresult = eval(data)\n", 1)
+    ]
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame(rows, columns=["code", "has_bugs"]).to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,139 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("MODEL_BACKENDS", "scorer")
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import main
+from backend.app.main import CodeReviewRequest, CodeReviewResponse, app
+from backend.app.services.deadline import MAX_TIMEOUT, Deadline, DeadlineExceeded
+from backend.app.services.llm_service import LLMService
+from backend.app.services.model_backends import BackendRouter, OpenAICompatibleBackend
+from backend.app.services.rate_limiter import FairScheduler, RateLimiter
+from mlops.monitoring.setup_monitoring import CANCELLED_REVIEWS
+
+client = TestClient(app)
+
+CODE = "def add(a, b):\n    return a + b\n"
+
+
+def review(**overrides):
+    payload = {"code": CODE, "language": "python", **overrides}
+    return client.post("/api/review", json=payload)
+
+
+def upstream_service(server) -> LLMService:
+    backend = OpenAICompatibleBackend("mock-model", base_url=server.url, api_key="test")
+    return LLMService(scheduler=FairScheduler(RateLimiter(rpm=1e9, tpm=1e9)), router=BackendRouter([backend]))
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    stop_at = time.monotonic() + timeout
+    while not condition() and time.monotonic() < stop_at:
+        time.sleep(0.02)
+    return condition()
+
+
+def cancelled_total(reason: str) -> float:
+    return CANCELLED_REVIEWS.labels(reason=reason)._value.get()
+
+
+def test_review_returns_findings_in_the_documented_shape():
+    response = review(code="try:\n    run()\nexcept:\n    pass\n")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    body = response.json()
+    # Same shape as CodeReviewResponse, though the record is encoded by FastJSONResponse
+    assert CodeReviewResponse(**body).model_dump() == body
+    assert list(body) == ["suggestions", "quality_score", "potential_bugs", "improvement_areas"]
+    assert any("except" in bug for bug in body["potential_bugs"])
+
+
+def test_unknown_priority_is_rejected():
+    assert review(priority="urgent").status_code == 422
+    assert review(priority="bulk").status_code == 200
+
+
+def test_non_positive_timeout_is_rejected_without_counting_a_cancellation():
+    cancelled = CANCELLED_REVIEWS.labels(reason="deadline")
+    before = cancelled._value.get()
+    assert review(timeout=-5).status_code == 422
+    assert review(timeout=0).status_code == 422
+    assert cancelled._value.get() == before
+
+
+def test_requested_timeout_is_capped():
+    assert Deadline(1e300).timeout == MAX_TIMEOUT
+    assert Deadline(0.5).timeout == 0.5
+    with pytest.raises(ValueError):
+        Deadline(-5)
+
+
+def test_expired_deadline_returns_504_and_closes_the_upstream_stream(monkeypatch, mock_llm):
+    server = mock_llm(first_token_delay=5.0)
+    monkeypatch.setattr(main, "llm_service", upstream_service(server))
+    before = cancelled_total("deadline")
+
+    started = time.monotonic()
+    response = review(timeout=0.5)
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 2.0
+    assert cancelled_total("deadline") == before + 1
+    # The provider sees the connection go away instead of finishing the reply
+    assert server.statuses() == [200]
+    assert wait_until(lambda: server.dropped == 1)
+
+
+def test_client_disconnect_cancels_the_review(monkeypatch, mock_llm):
+    server = mock_llm(first_token_delay=5.0)
+    monkeypatch.setattr(main, "llm_service", upstream_service(server))
+    monkeypatch.setattr(main, "DISCONNECT_POLL_INTERVAL", 0.05)
+    before = cancelled_total("disconnect")
+
+    class HungUpRequest:
+        async def is_disconnected(self):
+            # Hang up once the completion has reached the provider
+            return bool(server.statuses())
+
+    async def run():
+        started = time.monotonic()
+        response = await main.review_code(CodeReviewRequest(code=CODE, language="python"), HungUpRequest())
+        elapsed = time.monotonic() - started
+        # Keep the loop running, as the server's would, while the cancelled completion unwinds
+        for _ in range(100):
+            if server.dropped:
+                break
+            await asyncio.sleep(0.02)
+        return response, elapsed
+
+    response, elapsed = asyncio.run(run())
+
+    assert response.status_code == 499
+    assert elapsed < 2.0
+    assert cancelled_total("disconnect") == before + 1
+    assert server.dropped == 1
+
+
+def test_coalesced_caller_outlives_another_callers_deadline(mock_llm):
+    server = mock_llm(first_token_delay=0.6)
+    service = upstream_service(server)
+
+    async def run():
+        impatient = service.review_code(CODE, "python", deadline=Deadline(0.2))
+        patient = service.review_code(CODE, "python", deadline=Deadline(5.0))
+        return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+    impatient, patient = asyncio.run(run())
+
+    assert isinstance(impatient, DeadlineExceeded)
+    assert patient.suggestions == ["Looks good to me."]
+    # Both shared one completion, which ran to the end
+    assert server.statuses() == [200]
+    assert server.dropped == 0
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mlops import features
+from mlops.features import FEATURE_NAMES, feature_cache_path, load_feature_matrix
+
+
+def test_cache_key_follows_the_data(review_dataset, tmp_path):
+    cache_dir = str(tmp_path / "features")
+    before = feature_cache_path(review_dataset, cache_dir)
+    assert feature_cache_path(review_dataset, cache_dir) == before
+
+    with open(review_dataset, "a") as f:
+        f.write("\"print('one more')\",0\n")
+    assert feature_cache_path(review_dataset, cache_dir) != before
+
+
+def test_features_are_extracted_once_and_memory_mapped(review_dataset, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "features")
+    labels = pd.read_csv(review_dataset)["has_bugs"].tolist()
+    built = []
+    build = features.build_feature_matrix
+    monkeypatch.setattr(features, "build_feature_matrix", lambda data: built.append(len(data)) or build(data))
+
+    X, y, meta = load_feature_matrix(review_dataset, cache_dir)
+
+    assert built == [len(labels)]
+    assert isinstance(X, np.memmap) and isinstance(y, np.memmap)
+    assert X.shape == (len(labels), len(FEATURE_NAMES))
+    assert y.tolist() == labels
+    assert meta["rows"] == len(labels) and meta["path"] == feature_cache_path(review_dataset, cache_dir)
+    # Read-only, so no worker can scribble over the shared pages
+    with pytest.raises(ValueError):
+        X[0, 0] = 1.0
+
+    X_again, _, _ = load_feature_matrix(review_dataset, cache_dir)
+    assert built == [len(labels)]
+    np.testing.assert_array_equal(X_again, X)
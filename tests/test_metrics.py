@@ -0,0 +1,60 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.services.serialization import ReviewFindings, ReviewMetrics, ReviewRecord, dumps
+from mlops.metrics import HISTORY_COLUMNS, MetricsTracker
+
+FINDINGS = ReviewFindings(
+    suggestions=["Add docstrings", "Use logging"],
+    quality_score=0.8,
+    potential_bugs=["Unchecked division"],
+    improvement_areas=["Error handling"]
+)
+
+
+@pytest.fixture(scope="module")
+def mlflow_dir(tmp_path_factory):
+    # MetricsTracker logs to ./mlruns, and MLflow caches that store for the whole
+    # process, so every test runs from the same directory
+    path = tmp_path_factory.mktemp("mlflow")
+    cwd = os.getcwd()
+    os.chdir(path)
+    yield path
+    os.chdir(cwd)
+
+
+@pytest.fixture
+def tracker(mlflow_dir, tmp_path, monkeypatch):
+    # Newer MLflow releases need opting in to the file store
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    return MetricsTracker(history_path=str(tmp_path / "history.jsonl"))
+
+
+def test_missing_history_gives_an_empty_frame(tracker):
+    history = tracker.get_historical_metrics()
+    assert history.empty
+    assert list(history.columns) == HISTORY_COLUMNS
+
+
+def test_history_keeps_only_recent_reviews(tracker):
+    tracker.log_review_metrics("x = 1\n", "python", FINDINGS, prompt_version="detailed")
+    tracker.log_review_metrics("let x = 1;\n", "javascript", FINDINGS.to_dict())
+
+    old = ReviewRecord(
+        "y = 2\n", "python", "default", FINDINGS, ReviewMetrics.from_findings(FINDINGS),
+        (datetime.now() - timedelta(days=30)).isoformat()
+    )
+    with open(tracker.history_path, "ab") as f:
+        f.write(dumps(old) + b"\n")
+
+    recent = tracker.get_historical_metrics(days=7)
+    assert list(recent.columns) == HISTORY_COLUMNS
+    assert list(recent["language"]) == ["python", "javascript"]
+    assert list(recent["prompt_version"]) == ["detailed", "default"]
+    assert list(recent["num_suggestions"]) == [2, 2]
+    assert list(recent["num_bugs"]) == [1, 1]
+    assert recent["quality_score"].tolist() == [0.8, 0.8]
+
+    assert len(tracker.get_historical_metrics(days=60)) == 3
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+from openai import RateLimitError
+
+from backend.app.services.llm_service import LLMService
+from backend.app.services.model_backends import (
+    MIN_LATENCY_SAMPLES,
+    BackendRouter,
+    BackendUnavailableError,
+    ModelBackend,
+    OpenAICompatibleBackend
+)
+from backend.app.services.rate_limiter import FairScheduler, RateLimiter
+
+MESSAGES = [{"role": "user", "content": "review this"}]
+
+
+def backend_for(server, limiter=None) -> OpenAICompatibleBackend:
+    return OpenAICompatibleBackend("mock-model", base_url=server.url, api_key="test", limiter=limiter)
+
+
+def test_model_backend_is_abstract():
+    with pytest.raises(TypeError):
+        ModelBackend()
+
+
+def test_fails_over_to_next_backend_and_opens_breaker(mock_llm):
+    broken = mock_llm(fail_status=500)
+    healthy = mock_llm(reply="from the fallback")
+    router = BackendRouter([backend_for(broken), backend_for(healthy)], failure_threshold=2)
+
+    async def main():
+        return [await router.complete(MESSAGES, 0.0, 50) for _ in range(4)]
+
+    assert [r.strip() for r in asyncio.run(main())] == ["from the fallback"] * 4
+    _, served_by = asyncio.run(router.complete_with_backend(MESSAGES, 0.0, 50))
+    assert served_by is not router.primary
+    # Two failures open the primary's breaker; later calls skip it entirely
+    assert broken.statuses() == [500, 500]
+    assert router.breakers[router.primary.name].state == "open"
+
+
+def test_half_open_probe_closes_breaker_after_recovery(mock_llm):
+    flaky = mock_llm(fail_status=500, reply="primary")
+    fallback = mock_llm(reply="fallback")
+    router = BackendRouter([backend_for(flaky), backend_for(fallback)], failure_threshold=1, reset_timeout=0.2)
+
+    async def main():
+        await router.complete(MESSAGES, 0.0, 50)
+        flaky.fail_status = None
+        skipped = await router.complete(MESSAGES, 0.0, 50)
+        await asyncio.sleep(0.25)
+        probed = await router.complete(MESSAGES, 0.0, 50)
+        return skipped.strip(), probed.strip()
+
+    assert asyncio.run(main()) == ("fallback", "primary")
+    assert router.breakers[router.primary.name].state == "closed"
+
+
+def test_rate_limited_backend_does_not_open_breaker(mock_llm):
+    throttled = mock_llm(retry_after=0.01)
+    throttled.throttle_next = 1000
+    limiter = RateLimiter(rpm=1e9, tpm=1e9)
+    router = BackendRouter([backend_for(throttled, limiter)], failure_threshold=5)
+    service = LLMService(scheduler=FairScheduler(limiter), router=router)
+
+    async def main():
+        # Each call makes MAX_RATE_LIMIT_RETRIES + 1 attempts
+        for _ in range(3):
+            with pytest.raises(RateLimitError):
+                await service._complete(MESSAGES, 0.0, 50)
+
+    asyncio.run(main())
+    assert len(throttled.statuses()) > router.breakers[router.primary.name].failure_threshold
+    assert router.breakers[router.primary.name].state == "closed"
+
+
+def test_all_backends_broken_raises_unavailable(mock_llm):
+    broken = mock_llm(fail_status=503)
+    router = BackendRouter([backend_for(broken)], failure_threshold=1)
+
+    async def main():
+        with pytest.raises(Exception) as first:
+            await router.complete(MESSAGES, 0.0, 50)
+        assert not isinstance(first.value, BackendUnavailableError)
+        with pytest.raises(BackendUnavailableError):
+            await router.complete(MESSAGES, 0.0, 50)
+
+    asyncio.run(main())
+
+
+def test_slow_primary_is_hedged(mock_llm):
+    slow = mock_llm(first_token_delay=1.5, reply="slow")
+    fast = mock_llm(reply="fast")
+    router = BackendRouter([backend_for(slow), backend_for(fast)], hedge_percentile=0.95)
+    # The primary normally streams within 50ms
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.latency[router.primary.name].observe(0.05)
+
+    started = time.monotonic()
+    result, served_by = asyncio.run(router.complete_with_backend(MESSAGES, 0.0, 50))
+
+    assert result.strip() == "fast"
+    assert served_by is router.backends[1]
+    assert time.monotonic() - started < 1.0
+    assert router.hedged == 1
+    # The losing attempt is cancelled, which is not a failure
+    assert router.breakers[router.primary.name].failures == 0
+
+
+def test_fast_primary_is_not_hedged(mock_llm):
+    primary = mock_llm(reply="primary")
+    backup = mock_llm(reply="backup")
+    router = BackendRouter([backend_for(primary), backend_for(backup)], hedge_percentile=0.95)
+
+    assert asyncio.run(router.complete(MESSAGES, 0.0, 50)).strip() == "primary"
+    assert router.hedged == 0
+    assert backup.statuses() == []
+
+
+def test_hedge_is_charged_to_the_backup_limiter(mock_llm):
+    slow = mock_llm(first_token_delay=1.0, reply="slow")
+    fast = mock_llm(reply="fast", tpm=10000)
+    limiter = RateLimiter(rpm=100, tpm=10000)
+    router = BackendRouter([backend_for(slow), backend_for(fast, limiter)], hedge_percentile=0.95)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.latency[router.primary.name].observe(0.05)
+
+    assert asyncio.run(router.complete(MESSAGES, 0.0, 1000)).strip() == "fast"
+    assert router.hedged == 1
+    # One request slot is used; only the prompt stays charged once the hedge is done
+    assert limiter.requests.tokens == pytest.approx(99, abs=0.1)
+    assert 9990 < limiter.tokens.tokens < 10000
+
+
+def test_no_hedge_without_backup_capacity(mock_llm):
+    slow = mock_llm(first_token_delay=0.5, reply="slow")
+    backup = mock_llm(reply="backup")
+    limiter = RateLimiter(rpm=1, tpm=1e9)
+    limiter.try_acquire(1)
+    router = BackendRouter([backend_for(slow), backend_for(backup, limiter)], hedge_percentile=0.95)
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.latency[router.primary.name].observe(0.05)
+
+    assert asyncio.run(router.complete(MESSAGES, 0.0, 50)).strip() == "slow"
+    assert router.hedged == 0
+    assert backup.statuses() == []
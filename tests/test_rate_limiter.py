@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.app.services.llm_service import LLMService
+from backend.app.services.model_backends import BackendRouter, OpenAICompatibleBackend
+from backend.app.services.rate_limiter import FairScheduler, RateLimiter, parse_retry_after
+
+
+def make_service(server, limiter: RateLimiter) -> LLMService:
+    backend = OpenAICompatibleBackend("mock-model", base_url=server.url, api_key="test", limiter=limiter)
+    return LLMService(scheduler=FairScheduler(limiter), router=BackendRouter([backend]))
+
+
+def complete(service: LLMService, content: str, max_tokens: int = 100, **kwargs):
+    return service._complete([{"role": "user", "content": content}], 0.0, max_tokens, **kwargs)
+
+
+def test_parse_retry_after_prefers_milliseconds():
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_burst_over_rpm_is_spread_out_instead_of_rejected(mock_llm):
+    server = mock_llm(rpm=60)
+    service = make_service(server, RateLimiter(rpm=60, tpm=1e9))
+
+    async def main():
+        # Warm the client up, then let both quotas refill before the burst
+        await complete(service, "warm-up")
+        await asyncio.sleep(1.1)
+        started = time.monotonic()
+        results = await asyncio.gather(*(complete(service, f"review {i}") for i in range(63)))
+        return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(main())
+
+    assert len(results) == 63
+    assert 429 not in server.statuses()
+    # 60 fit the burst; the bucket refills one request per second after that
+    assert elapsed >= 2.5
+
+
+def test_tpm_holds_calls_until_tokens_are_returned(mock_llm):
+    server = mock_llm(tpm=2500, first_token_delay=0.2)
+    service = make_service(server, RateLimiter(rpm=1e9, tpm=2500))
+
+    async def main():
+        return await asyncio.gather(*(complete(service, f"review {i}", max_tokens=1000) for i in range(3)))
+
+    asyncio.run(main())
+
+    assert server.statuses() == [200, 200, 200]
+    arrivals = [arrived for arrived, *_ in server.log]
+    # Only two ~1000-token calls fit the quota; the third is admitted as soon as the
+    # first is reconciled, long before the bucket would have refilled on its own
+    assert 0.15 <= arrivals[2] - arrivals[0] < 1.0
+
+
+def test_429_pauses_admissions_for_retry_after(mock_llm):
+    server = mock_llm(retry_after=0.5)
+    server.throttle_next = 1
+    limiter = RateLimiter(rpm=1e9, tpm=1e9)
+    service = make_service(server, limiter)
+
+    content, served_by = asyncio.run(complete(service, "review"))
+    assert content.strip() == "Looks good to me." and served_by == service.model
+
+    (first, _, first_status), (second, _, second_status) = server.log
+    assert (first_status, second_status) == (429, 200)
+    assert second - first >= 0.45
+
+
+def test_limits_resync_from_response_headers(mock_llm):
+    server = mock_llm(rpm=120, tpm=40000)
+    limiter = RateLimiter(rpm=500, tpm=90000)
+
+    asyncio.run(complete(make_service(server, limiter), "review"))
+
+    assert limiter.requests.per_minute == 120
+    assert limiter.tokens.per_minute == 40000
+
+
+def test_interactive_overtakes_queued_bulk_work(mock_llm):
+    server = mock_llm()
+    limiter = RateLimiter(rpm=600, tpm=1e9)
+    service = make_service(server, limiter)
+    # Exhaust the request bucket so every caller has to queue
+    while limiter.try_acquire(1) <= 0:
+        pass
+
+    async def main():
+        bulk = [asyncio.ensure_future(complete(service, f"bulk {i}", tenant="nightly", priority="bulk"))
+                for i in range(5)]
+        await asyncio.sleep(0.01)
+        await complete(service, "interactive", tenant="alice", priority="interactive")
+        await asyncio.gather(*bulk)
+
+    asyncio.run(main())
+
+    prompts = server.prompts()
+    assert len(prompts) == 6
+    assert prompts[0] == "interactive"
+
+
+def test_unknown_priority_is_rejected():
+    scheduler = FairScheduler(RateLimiter(rpm=1e9, tpm=1e9))
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.acquire(10, priority="urgent"))
+
+
+def test_failed_call_is_charged_only_for_its_prompt(mock_llm):
+    server = mock_llm(fail_status=500, tpm=10000)
+    limiter = RateLimiter(rpm=1e9, tpm=10000)
+    service = make_service(server, limiter)
+
+    with pytest.raises(Exception):
+        asyncio.run(complete(service, "review", max_tokens=1000))
+
+    # Only the prompt is billed; the 1000-token output reservation comes back
+    assert limiter.tokens.tokens > 9990
+
+
+def test_abandoned_call_returns_its_output_reservation(mock_llm):
+    server = mock_llm(first_token_delay=1.0, tpm=10000)
+    limiter = RateLimiter(rpm=1e9, tpm=10000)
+    service = make_service(server, limiter)
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(complete(service, "review", max_tokens=1000), 0.2)
+
+    asyncio.run(main())
+    assert limiter.tokens.tokens > 9990
+
+
+def test_waiter_cancelled_after_admission_gives_capacity_back():
+    limiter = RateLimiter(rpm=10, tpm=10000)
+    scheduler = FairScheduler(limiter)
+
+    async def main():
+        limiter.on_rate_limited(10)
+        waiter = asyncio.ensure_future(scheduler.acquire(1000))
+        await asyncio.sleep(0)
+        # Admit it, then cancel before it gets to run
+        limiter.paused_until = 0
+        scheduler._dispatch()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(main())
+    assert limiter.tokens.tokens == pytest.approx(10000, abs=1)
+    assert limiter.requests.tokens == pytest.approx(10, abs=0.01)
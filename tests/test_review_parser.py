@@ -0,0 +1,71 @@
+import pytest
+
+from backend.app.services.review_parser import parse_review
+
+STRUCTURED = """Quality score: 0.6
+
+Potential bugs:
+- `divide` raises ZeroDivisionError when `b` is 0.
+- The file handle is never closed.
+
+Improvement areas:
+1. Add type hints to public functions,
+   starting with `divide`.
+
+Suggestions:
+- None
+"""
+
+MARKDOWN = """## Code Quality Assessment
+Overall the code is readable. Score: 7/10
+
+## Potential Bugs
+* **Off-by-one** in the loop bound.
+
+## Performance Optimization Recommendations
+* Cache the compiled regex.
+
+### Security Vulnerabilities
+- `eval` on user input.
+"""
+
+
+def test_parses_requested_format():
+    findings = parse_review(STRUCTURED)
+    assert findings.quality_score == 0.6
+    assert findings.potential_bugs == [
+        "`divide` raises ZeroDivisionError when `b` is 0.",
+        "The file handle is never closed."
+    ]
+    assert findings.improvement_areas == ["Add type hints to public functions, starting with `divide`."]
+    assert findings.suggestions == []
+
+
+def test_parses_markdown_headings_and_scaled_scores():
+    findings = parse_review(MARKDOWN)
+    assert findings.quality_score == 0.7
+    assert findings.potential_bugs == ["Off-by-one in the loop bound.", "`eval` on user input."]
+    assert findings.improvement_areas == ["Cache the compiled regex."]
+
+
+def test_unstructured_reply_is_kept_as_a_suggestion():
+    findings = parse_review("Looks fine, but consider splitting the function.")
+    assert findings.suggestions == ["Looks fine, but consider splitting the function."]
+    assert findings.potential_bugs == []
+    assert findings.quality_score == 1.0
+
+
+@pytest.mark.parametrize("placeholder", [
+    "None", "None.", "None identified.", "None found.", "None at this time.",
+    "No issues.", "No major issues found.", "No bugs detected", "N/A", "Nothing to report."
+])
+def test_empty_section_placeholders_are_dropped(placeholder):
+    findings = parse_review(f"Quality score: 0.9\n\nPotential bugs:\n- {placeholder}\n\n"
+                            "Suggestions:\n- Add a docstring.\n")
+    assert findings.potential_bugs == []
+    assert findings.suggestions == ["Add a docstring."]
+
+
+def test_findings_starting_with_no_are_kept():
+    findings = parse_review("Potential bugs:\n- No input validation on `path`.\n- Nothing closes the socket.\n")
+    assert findings.potential_bugs == ["No input validation on `path`.", "Nothing closes the socket."]
@@ -0,0 +1,83 @@
+import asyncio
+import os
+
+import pytest
+
+from backend.app.review_repo import MANIFEST_TTL, main, review_repository
+from backend.app.services import llm_service
+from backend.app.services.llm_service import LLMService
+from backend.app.services.model_backends import BackendRouter, InProcessScorerBackend, OpenAICompatibleBackend
+from backend.app.services.rate_limiter import FairScheduler, RateLimiter
+from backend.app.services.shared_state import SQLiteReviewCache
+
+
+def make_repo(root):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "risky.py").write_text("try:\n    run()\nexcept:\n    pass\n")
+    (root / "pkg" / "clean.py").write_text("def add(a, b):\n    return a + b\n")
+    (root / "README.md").write_text("not reviewed\n")
+    os.symlink("/nonexistent/target.py", root / "pkg" / "broken.py")
+
+
+def run(root, manifest, backends=None):
+    service = LLMService(
+        scheduler=FairScheduler(RateLimiter(rpm=1e9, tpm=1e9)),
+        router=BackendRouter(backends or [InProcessScorerBackend()]),
+        cache=manifest
+    )
+    return asyncio.run(review_repository(str(root), service, jobs=4, max_bytes=200_000, tenant="test"))
+
+
+def test_reviews_each_file_and_skips_dangling_symlinks(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    make_repo(root)
+    manifest = SQLiteReviewCache(str(tmp_path / "manifest.db"), ttl=MANIFEST_TTL)
+
+    results, stats = run(root, manifest)
+
+    assert list(results) == ["pkg/clean.py", "pkg/risky.py"]
+    assert stats["reviewed"] == 2 and stats["failed"] == 0
+    # Findings come from each file's own review, not a canned placeholder
+    assert results["pkg/clean.py"].potential_bugs == []
+    assert any("except" in bug for bug in results["pkg/risky.py"].potential_bugs)
+    assert results["pkg/risky.py"].quality_score < results["pkg/clean.py"].quality_score
+
+
+def test_rerun_skips_unchanged_files_until_the_prompt_changes(tmp_path, monkeypatch):
+    root = tmp_path / "repo"
+    root.mkdir()
+    make_repo(root)
+    manifest = SQLiteReviewCache(str(tmp_path / "manifest.db"), ttl=MANIFEST_TTL)
+
+    run(root, manifest)
+    _, stats = run(root, manifest)
+    assert stats["skipped"] == 2 and stats["reviewed"] == 0
+
+    monkeypatch.setattr(llm_service, "PROMPT_VERSION", "structured-next")
+    _, stats = run(root, manifest)
+    assert stats["skipped"] == 0 and stats["reviewed"] == 2
+
+
+def test_reviews_from_a_fallback_backend_are_not_kept(tmp_path, mock_llm):
+    root = tmp_path / "repo"
+    root.mkdir()
+    make_repo(root)
+    manifest = SQLiteReviewCache(str(tmp_path / "manifest.db"), ttl=MANIFEST_TTL)
+    dead = OpenAICompatibleBackend("gpt-4", base_url=mock_llm(fail_status=503).url, api_key="test")
+
+    results, stats = run(root, manifest, [dead, InProcessScorerBackend()])
+    assert stats["reviewed"] == 2
+    assert any("except" in bug for bug in results["pkg/risky.py"].potential_bugs)
+
+    # Nothing was stored under the primary's key, so the next run asks again
+    _, stats = run(root, manifest, [dead, InProcessScorerBackend()])
+    assert stats["skipped"] == 0 and stats["reviewed"] == 2
+
+
+@pytest.mark.parametrize("option", [["--jobs", "0"], ["--jobs", "-1"], ["--jobs", "two"], ["--timeout", "0"]])
+def test_cli_rejects_non_positive_options(tmp_path, option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(tmp_path), *option])
+    assert exit_info.value.code == 2
+    assert option[0] in capsys.readouterr().err
@@ -0,0 +1,39 @@
+import mlflow
+import pytest
+
+from mlops import search
+
+
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    # Newer MLflow releases need opting in to the file store
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    uri = f"file:{tmp_path / 'mlruns'}"
+    previous = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(uri)
+    yield uri
+    mlflow.set_tracking_uri(previous)
+
+
+def test_parallel_search_logs_each_candidate_under_the_search_run(review_dataset, tracking_uri, tmp_path, monkeypatch):
+    # load_feature_matrix caches under ./data/features
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(search, "SEARCH_SPACE", {"LogisticRegression": {"C": [0.1, 1.0]}})
+    mlflow.set_experiment("search-test")
+
+    with mlflow.start_run() as parent:
+        results = search.run_parallel(review_dataset, folds=2, workers=1)
+
+    assert sorted(params["C"] for _, params, _, _ in results) == [0.1, 1.0]
+    assert all(0.0 <= metrics["f1"] <= 1.0 for _, _, metrics, _ in results)
+
+    parent_run = mlflow.get_run(parent.info.run_id)
+    assert parent_run.data.params["rows"] == "8"
+    trials = mlflow.search_runs(
+        experiment_ids=[parent.info.experiment_id],
+        filter_string=f"tags.mlflow.parentRunId = '{parent.info.run_id}'"
+    )
+    assert len(trials) == 2
+    assert sorted(trials["params.C"]) == ["0.1", "1.0"]
+    assert set(trials["params.model_type"]) == {"LogisticRegression"}
+    assert trials["metrics.f1"].notna().all()
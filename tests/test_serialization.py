@@ -0,0 +1,50 @@
+import json
+
+from backend.app.services import serialization
+from backend.app.services.serialization import (
+    ReviewFindings, ReviewMetrics, ReviewRecord, as_findings, dumps, loads
+)
+
+FINDINGS = ReviewFindings(
+    suggestions=["Add docstrings"],
+    quality_score=0.75,
+    potential_bugs=["Division by zero when `b` is 0 — unchecked"],
+    improvement_areas=[]
+)
+
+
+def make_record() -> ReviewRecord:
+    return ReviewRecord(
+        "def f(a, b):\n    return a / b\n", "python", "concise",
+        FINDINGS, ReviewMetrics.from_findings(FINDINGS), "2026-10-19T12:00:00"
+    )
+
+
+def test_findings_round_trip():
+    encoded = dumps(FINDINGS)
+    assert isinstance(encoded, bytes)
+    assert loads(encoded) == FINDINGS.to_dict()
+    assert ReviewFindings.from_dict(loads(encoded)) == FINDINGS
+    assert as_findings(loads(encoded)) == FINDINGS
+
+
+def test_record_round_trip_encodes_nested_records():
+    record = make_record()
+    data = loads(dumps(record))
+
+    assert data["review_results"] == FINDINGS.to_dict()
+    assert data["metrics"] == {"quality_score": 0.75, "num_suggestions": 1, "num_bugs": 1, "num_improvements": 0}
+    assert ReviewRecord.from_dict(data) == record
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    record = make_record()
+    fast = dumps(record)
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    fallback = dumps(record)
+
+    assert isinstance(fallback, bytes)
+    assert json.loads(fallback) == json.loads(fast)
+    assert loads(fallback) == loads(fast)
+    assert loads(fallback.decode("utf-8")) == loads(fast)
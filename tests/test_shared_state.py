@@ -0,0 +1,85 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+from backend.app.services.llm_service import LLMService
+from backend.app.services.model_backends import BackendRouter, InProcessScorerBackend
+from backend.app.services.rate_limiter import FairScheduler, RateLimiter
+from backend.app.services.serialization import ReviewFindings
+from backend.app.services.shared_state import LIMITER_LOCKED_RETRY, SharedRateLimiter, SQLiteReviewCache
+
+
+def hold_write_lock(path: str, seconds: float) -> threading.Thread:
+    """Hold the database's write lock from another connection, as a busy worker would"""
+    locked = threading.Event()
+
+    def hold():
+        db = sqlite3.connect(path, isolation_level=None)
+        db.execute("BEGIN IMMEDIATE")
+        locked.set()
+        time.sleep(seconds)
+        db.execute("COMMIT")
+        db.close()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    locked.wait(1)
+    return thread
+
+
+def test_shared_limiter_buckets_are_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first, second = SharedRateLimiter(path, rpm=2, tpm=1e9), SharedRateLimiter(path, rpm=2, tpm=1e9)
+
+    assert first.try_acquire(1) <= 0
+    assert second.try_acquire(1) <= 0
+    assert first.try_acquire(1) > 0
+
+
+def test_locked_admission_reports_a_short_wait_instead_of_blocking(tmp_path):
+    path = str(tmp_path / "limits.db")
+    limiter = SharedRateLimiter(path, rpm=1e9, tpm=1e9)
+    limiter.try_acquire(1)
+
+    holder = hold_write_lock(path, 1.0)
+    started = time.monotonic()
+    wait = limiter.try_acquire(1)
+    blocked = time.monotonic() - started
+    holder.join()
+
+    assert wait == LIMITER_LOCKED_RETRY
+    assert blocked < 0.5
+    assert limiter.try_acquire(1) <= 0
+
+
+def test_cache_writes_under_contention_do_not_stall_the_event_loop(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteReviewCache(path)
+    cache.get("warm-up")
+    service = LLMService(
+        scheduler=FairScheduler(RateLimiter(rpm=1e9, tpm=1e9)),
+        router=BackendRouter([InProcessScorerBackend()]),
+        cache=cache
+    )
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        holder = hold_write_lock(path, 0.5)
+        findings = await service.review_code("print('hi')\n", "python")
+        await asyncio.to_thread(holder.join)
+        ticking.cancel()
+        return findings, ticks
+
+    findings, ticks = asyncio.run(main())
+    assert isinstance(findings, ReviewFindings)
+    # The loop kept running while the cache write waited ~0.5s for the lock
+    assert ticks >= 20
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.app.services.single_flight import AsyncSingleFlight, SingleFlight, request_key
+
+
+def test_request_key_ignores_cosmetic_differences():
+    assert request_key("x = 1  \r\ny = 2\n", "Python") == request_key("x = 1\ny = 2", "python")
+    assert request_key("x = 1", "python") != request_key("x = 1", "python", model="other")
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "review"
+
+    async def main():
+        flight = AsyncSingleFlight("test")
+        results = await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(main())
+    assert results == ["review"] * 5
+    assert calls == 1
+    assert in_flight == 0
+
+
+def test_errors_reach_every_waiter_and_next_call_retries():
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def main():
+        flight = AsyncSingleFlight("test")
+        results = await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        with pytest.raises(ValueError):
+            await flight.do("k", failing)
+
+    asyncio.run(main())
+    assert calls == 2
+
+
+def test_shared_task_survives_until_last_waiter_cancels():
+    async def main():
+        upstream_cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+
+        flight = AsyncSingleFlight("test")
+        first = asyncio.ensure_future(flight.do("k", slow))
+        second = asyncio.ensure_future(flight.do("k", slow))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not upstream_cancelled.is_set()
+
+        second.cancel()
+        await asyncio.wait_for(upstream_cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_stale_waiters_do_not_touch_a_newer_flight():
+    async def main():
+        flight = AsyncSingleFlight("test")
+
+        async def quick():
+            return 1
+
+        # Waiters of the first flight resume only after its task completes, by
+        # which time a second flight for the same key may already be running
+        first = [asyncio.ensure_future(flight.do("k", quick)) for _ in range(3)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        upstream_cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+
+        second = asyncio.ensure_future(flight.do("k", slow))
+        assert await asyncio.gather(*first) == [1, 1, 1]
+        await asyncio.sleep(0.01)
+
+        second.cancel()
+        await asyncio.wait_for(upstream_cancelled.wait(), 1)
+
+    asyncio.run(main())
+
+
+def test_new_caller_does_not_join_a_flight_being_cancelled():
+    async def main():
+        flight = AsyncSingleFlight("test")
+        calls = 0
+
+        async def slow_to_unwind():
+            nonlocal calls
+            calls += 1
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # Like closing the upstream stream after a cancel
+                await asyncio.shield(asyncio.sleep(0.1))
+            return "review"
+
+        async def fresh():
+            nonlocal calls
+            calls += 1
+            return "review"
+
+        abandoned = asyncio.ensure_future(flight.do("k", slow_to_unwind))
+        await asyncio.sleep(0.01)
+        abandoned.cancel()
+        await asyncio.sleep(0.01)
+
+        # The cancelled task is still unwinding; a new caller must get its own flight
+        assert await flight.do("k", fresh) == "review"
+        assert calls == 2
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+
+    asyncio.run(main())
+
+
+def test_threaded_single_flight_shares_result():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def fn():
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(1)
+        return "review"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fn)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fn, timeout=1))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert results == ["review"] * 4
+    assert calls == 1